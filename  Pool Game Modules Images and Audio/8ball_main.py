@@ -5,6 +5,14 @@
 # Description: Main File for 8 ball Video Game Culminating #
 #              - Use Mouse/Trackpad to Control             #
 #              - Hold Mouse to Power Up                    #
+#              - Press S to Skip Shot Animations           #
+#              - Press F to Fast-Forward Shots             #
+#              - Press U to Undo the Last Shot             #
+#              - Press P to Show Frame Timings             #
+#              - Press G to Toggle the Aim Guide           #
+#              - Press R for a Rematch After the Game      #
+#              - Set network to play a friend over TCP     #
+#              - Set opponent to play the computer         #
 ############################################################
 
 # ============================== #
@@ -15,331 +23,446 @@ import pygame
 import pymunk
 import pymunk.pygame_util  # allows combining both modules visually
 import ball8_sprites
-import math
+import ball8_engine
+import ball8_replay
+import ball8_profiler
+import ball8_input
+import ball8_assets
+import ball8_net
+import ball8_telemetry
+import ball8_ai
+from ball8_assets import assets, view
 
 # ============================== #
 #            DISPLAY             #
 # ============================== #
 
-screen_w = 1200
+screen_w = 1200  # Logical layout; the view scales it to the window
 screen_h = 678
 bottom_p = 80  # Extra space for bottom panel
-screen = pygame.display.set_mode((screen_w, screen_h + bottom_p))
-pygame.display.set_caption("8 Ball Pool")
-
-# ============================== #
-#     BACKGROUND ENTITIES        #
-# ============================== #
-
-background = pygame.Surface(screen.get_size())
-background.fill((139, 134, 128))
-
-# ============================== #
-#            SOUND               #
-# ============================== #
-
-pygame.mixer.init()
-pygame.init()
-
-# Background Music
-
-pygame.mixer.music.load("background_music.mp3")  # Load background music
-pygame.mixer.music.set_volume(0.2)
-pygame.mixer.music.play(-1)                      # Loop the music
-
-# Sound Effects - when shot
-shotSound = pygame.mixer.Sound("shot.mp3")
-shotSound.set_volume(0.2)
-
-# Sound Effects - when a normal ball is potted
-pottedSound = pygame.mixer.Sound("potted.mp3")
-pottedSound.set_volume(1.0)
-
-# ============================== #
-#            ENTITIES            #
-# ============================== #
-
-# Create the physics simulation space
-space = pymunk.Space()
-static_body = space.static_body  # Required to attach static objects (like cushions)
-drawing = pymunk.pygame_util.DrawOptions(screen)
-
-# Table setup
-table = ball8_sprites.PoolTable()
-allSpritesTable = pygame.sprite.Group(table)
-
-# Cushion setup (adds to physics space)
-cushions = []
-for c_n in range(6):
-    cushions.append(ball8_sprites.Cushions(c_n, space))
-
-# Bottom Panel setup
-bottom_p = ball8_sprites.BottomPanel(screen_w, bottom_p, screen_h)
-allSpritesBottomPanel = pygame.sprite.Group(bottom_p)
-
-# ============================== #
-#             BALLS              #
-# ============================== #
-
-ball_dia = 36  # Diameter of each ball
-
-balls = []
-rows = 5
-imageOfBall = 1
-
-# Arrange 15 balls in a triangular rack
-
-for col in range(5):
-
-    for row in range(rows):
-
-        """
-        To calculate the position of each ball in the rack:
-        - The x position starts at 250 from the left,
-          then moves right by (ball diameter + 1) for each column,
-          spacing balls evenly horizontally
-
-        - The y position starts at 267 from the top,
-          moves down by (ball diameter + 1) pixels for each ball in the current column (row number),
-          and then shifts down by half a ball diameter times the column number,
-          which staggers the balls vertically to create the triangular rack shape
-        """
-
-        pos = (250 + (col * (ball_dia + 1)), 267 + (row * (ball_dia + 1)) + (col * (ball_dia / 2)))
-
-        """
-        Create a new Ball instance/object at the calculated position with given radius,
-        space and image number
-        """
-
-        n_ball = ball8_sprites.Ball(ball_dia / 2, pos, space, static_body, imageOfBall)
-
-        """
-        Adds the new ball to the list of ball
-        """
-        balls.append(n_ball)
-
-        """
-
-        Increases image index for the next ball to assign the correct ball image.
-
-        """
-
-        imageOfBall += 1
-
-    """
-
-    Decreases the number of balls in the next column by one,
-    so the rack forms a triangle shape (5 balls in first column,
-    then 4, then 3, ...)
-
-    """
-
-    rows -= 1
-
-# Cue ball setup (white ball)
-
-cueBallPos = (888, (678 / 2))
-
-c_ball = ball8_sprites.Ball(ball_dia / 2, cueBallPos, space, static_body, 16)
-
-balls.append(c_ball)
-
-allSpritesBalls = pygame.sprite.Group(balls)
-
-# Cue setup
-cue = ball8_sprites.Cue((balls[-1].get_position()))
-
-# Power bar setup
-powerBar = ball8_sprites.PowerBar()
-
-# ============================== #
-#         POTTING CHECK          #
-# ============================== #
-
-potted_balls = []             # Track names of potted balls for bottom bar
-potted_balls_sprites = []     # Track sprites of potted balls
-allSpritesPottedBalls = []    # Sprite group placeholder
-pockets = ball8_sprites.Pockets(pottedSound, screen_h)  # Handles pocket detection
-
-# ============================== #
-#        LABELS / LIVES          #
-# ============================== #
-
-pos = ((screen.get_width() / 2), 738)
-label1 = ball8_sprites.Label(5, pos)
-allSpritesLabels = pygame.sprite.Group(label1)
-
-# ============================== #
-#         START SCREEN           #
-# ============================== #
-
-start_screen = True
-start_background = pygame.image.load("start_screen.png")
-start_background = pygame.transform.scale(start_background, (1200, 758))
-
-while start_screen:
-
+resolution = None  # Window size to fit, e.g. (1280, 720) for small kiosks or (3840, 2160); None draws at 1200x758
+render_fps = 120   # Frames drawn per second (60 is fine on weak hardware)
+physics_hz = 120   # Physics steps per second, independent of the frame rate
+fast_forward = 4   # Playback speed while F is toggled on
+replay_path = None  # Set to a file name (e.g. "last_game.8br") to record every physics step for review
+profile_csv = None  # Set to a file name (e.g. "frames.csv") to stream per-phase frame timings
+telemetry_path = None  # Set to "shots.jsonl" (readable) or e.g. "shots.8bt" (binary) to log every impact, pot and scratch
+rack = "8ball"      # "8ball", "9ball", "snooker" or "stress" (hundreds of balls for load testing)
+friction = "pivot"  # "pivot" (a joint per ball) or "damping" (no joints, rolls the same; cheaper on big stress racks)
+cue_prewarm = True  # Rotate the cue for the angles around the opening aim at startup instead of while first aiming
+asset_cache_dir = None  # Set to a folder (e.g. ".asset_cache") to keep decoded images and sounds between launches
+network = None      # None plays alone, "host" waits for a friend to join, "client" joins net_address
+net_address = ("127.0.0.1", ball8_net.PORT)
+net_sync = "resim"  # Client only: "resim" re-plays each shot locally, "snapshots" follows the host's ball positions
+opponent = None     # None plays alone, "easy", "medium" or "hard" takes every other shot as the computer (offline only)
+
+# Worker processes (the computer opponent's) import this file again, so only a direct run starts the game
+if __name__ == "__main__":
+
+    if resolution is not None:
+        view.set_resolution(resolution)  # Every image is pre-scaled once for this size, nothing is scaled per frame
+    screen = pygame.display.set_mode(view.get_screen_size())
+    pygame.display.set_caption("8 Ball Pool")
+
+    # ============================== #
+    #         START SCREEN           #
+    # ============================== #
+
+    # Only the start screen is decoded before the first frame; everything else loads behind it
+    assets.set_disk_cache(asset_cache_dir)
+    start_background = assets.get_scaled("start_screen.png", (1200, 758))
     screen.blit(start_background, (0, 0))
     pygame.display.flip()
 
-    for event in pygame.event.get():
+    # ============================== #
+    #            SOUND               #
+    # ============================== #
 
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            exit()
+    pygame.mixer.init()
+    pygame.init()
 
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE:
-                start_screen = False
+    # Background Music (streamed from the file, so opening it is cheap)
 
-# ============================== #
-#        GAME VARIABLES          #
-# ============================== #
-
-clock = pygame.time.Clock()
-keepGoing = True
-shot = True              # True if no balls are moving
-force = 0
-power = False
-cue_angle = 0
-cueball_ispotted = False
-lives = 5
-over = False
-
-# ============================== #
-#         MAIN GAME LOOP         #
-# ============================== #
-
-while keepGoing:
+    pygame.mixer.music.load("background_music.mp3")  # Load background music
+    pygame.mixer.music.set_volume(0.2)
+    pygame.mixer.music.play(-1)                      # Loop the music
 
-    if not over:
+    # Ball and cue images, sound effects and fonts are decoded on a background thread
+    loader = ball8_assets.AssetLoader(assets).start()
 
-        clock.tick(120)
-        space.step(1 / 120)  # Physics engine
-        screen.fill((50, 50, 50))
-        screen.blit(background, (0, 0))
+    start_screen = True
+    start_clock = pygame.time.Clock()
 
-        allSpritesTable.update()
-        allSpritesTable.draw(screen)
-
-        # Game Over condition check
-        if (label1.get_lives()) == 0 or len(balls) == 1:
-            over = True
+    while start_screen:
 
         for event in pygame.event.get():
-            shot = True  # balls are stationary
-
-        # Pocket detection for all balls
-
-        cueball_ispotted = pockets.if_potted(
-            balls, space, potted_balls,
-            allSpritesBalls, cueball_ispotted,
-            potted_balls_sprites, allSpritesPottedBalls
-        ) # uses sprites
-
-        # Check if any ball is moving
-
-        for b in balls:
-
-            if abs(b.get_body().velocity[0]) > 0.1 or abs(b.get_body().velocity[1]) > 0.1:
-                shot = False  # Ball is moving
 
-            # Quit event
             if event.type == pygame.QUIT:
-                keepGoing = False
-
-            # Cue rotation based on mouse movement
-            if event.type == pygame.MOUSEMOTION:
-
-                mouse_pos = pygame.mouse.get_pos()
+                pygame.quit()
+                exit()
 
-                cueBall_pos = balls[-1].get_position()
+            if event.type == pygame.VIDEOEXPOSE:
+                pygame.display.flip()
 
-                cue_angle = cue.update(mouse_pos, cueBall_pos) # updates the image of the cue so that it rotates
-
-            # Start charging power when mouse pressed
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    start_screen = False
+
+        start_clock.tick(30)  # Leave the CPU to the loader; the start screen does not change
+
+    loader.wait()
+
+    # Sound Effects - when shot
+    shotSound = assets.get_sound("shot.mp3")
+
+    # Sound Effects - when a normal ball is potted
+    pottedSound = assets.get_sound("potted.mp3")
+
+    # ============================== #
+    #     BACKGROUND ENTITIES        #
+    # ============================== #
+
+    background = pygame.Surface(screen.get_size())
+    background.fill((139, 134, 128))
+
+    # ============================== #
+    #            ENTITIES            #
+    # ============================== #
+
+    # The engine owns the physics space, cushions, rack, pockets, lives and score
+    game = ball8_engine.GameState(lives=5, headless=False, potted_sound=pottedSound, dt=1 / physics_hz, rack=rack,
+                                   friction=friction)
+    timestep = ball8_engine.FixedTimestep(game)
+    profiler = ball8_profiler.FrameProfiler()
+    game.set_profiler(profiler)
+    if profile_csv is not None:
+        profiler.open_csv(profile_csv)
+    recorder = None
+    if replay_path is not None:
+        recorder = ball8_replay.ReplayRecorder(replay_path)
+        recorder.attach(game)
+    telemetry = None
+    if telemetry_path is not None:
+        telemetry = ball8_telemetry.Telemetry(telemetry_path)
+        telemetry.attach(game)
+    space = game.get_space()
+    balls = game.get_balls()  # cue ball is always balls[-1]
+    drawing = pymunk.pygame_util.DrawOptions(screen)
+
+    # Table setup
+    table = ball8_sprites.PoolTable()
+    allSpritesTable = pygame.sprite.Group(table)
+
+    # Bottom Panel setup
+    bottom_p = ball8_sprites.BottomPanel(screen_w, bottom_p, screen_h)
+    allSpritesBottomPanel = pygame.sprite.Group(bottom_p)
+
+    # The table and panel never move, so they are baked into the background that dirty regions are restored from
+    allSpritesTable.draw(background)
+    allSpritesBottomPanel.draw(background)
+
+    # Everything that moves or changes is drawn through one dirty-rectangle group
+    allSpritesDirty = pygame.sprite.LayeredDirty()
+
+    # ============================== #
+    #             BALLS              #
+    # ============================== #
+
+    allSpritesBalls = pygame.sprite.Group(balls)
+    allSpritesDirty.add(balls, layer=1)
+
+    # Aim guide setup (drawn under the cue, only while a shot can be taken)
+    aimGuide = ball8_sprites.AimGuide(game)
+    allSpritesDirty.add(aimGuide, layer=2)
+
+    # Cue setup
+    cue = ball8_sprites.Cue((balls[-1].get_position()))
+    if cue_prewarm:
+        cue.prewarm()
+    allSpritesDirty.add(cue, layer=2)
+
+    # Power bar setup
+    powerBar = ball8_sprites.PowerBar()
+    allSpritesDirty.add(powerBar, layer=3)
+
+    # ============================== #
+    #         POTTING CHECK          #
+    # ============================== #
+
+    potted_balls = game.get_potted_balls()  # Names of potted balls, filled in by the engine
+    potted_balls_sprites = []               # Track sprites of potted balls
+    allSpritesPottedBalls = pygame.sprite.Group()  # Grows by one sprite per potted ball
+
+    # ============================== #
+    #        LABELS / LIVES          #
+    # ============================== #
+
+    pos = ((screen_w / 2), 738)  # logical, like every sprite position
+    label1 = ball8_sprites.Label(game, pos)
+    allSpritesLabels = pygame.sprite.Group(label1)
+    allSpritesDirty.add(label1, layer=1)
+
+    # Frame timing overlay (hidden until P is pressed)
+    overlay = ball8_profiler.ProfilerOverlay(profiler, (10, 10))
+    allSpritesDirty.add(overlay, layer=4)
+
+    # Two-player game: the host owns the table and whose turn it is, shots travel as (angle, force)
+    session = None
+    if network is not None:
+        session = ball8_net.NetSession(network, game, net_address, net_sync).start()
+
+    # Computer opponent: simulates candidate shots on copies of the table in worker processes
+    ai = None
+    if opponent is not None and network is None:
+        ai = ball8_ai.AIPlayer(opponent)
+
+    # ============================== #
+    #        GAME VARIABLES          #
+    # ============================== #
+
+    clock = pygame.time.Clock()
+    controls = ball8_input.InputDispatcher()
+    clock.tick()  # Time spent on the start screen is not fed to the physics
+    keepGoing = True
+    shot = True              # True if no balls are moving
+    force = 0
+    power = False
+    cue_angle = 0
+    over = False
+    skip_animation = False   # True resolves each shot instantly and jumps to the final layout
+    undo_snapshot = None     # Table as it was before the last shot
+    show_guide = True        # G hides or shows the aim guide
+    last_caption = None      # Network games show whose turn it is in the window title
+    ai_turn = False          # True while the computer opponent is due to shoot
+    aimGuide.visible = show_guide
+
+    # Paint the whole table once; from here on only dirty regions are redrawn
+    screen.blit(background, (0, 0))
+    pygame.display.flip()
+    allSpritesDirty.clear(screen, background)
+
+    # ============================== #
+    #         MAIN GAME LOOP         #
+    # ============================== #
+
+    while keepGoing:
+
+        if not over:
+
+            frame_ms = clock.tick(render_fps)
+            profiler.begin_frame()
+            alpha = timestep.advance(frame_ms / 1000)  # Physics engine, pocketing and cue ball re-spot
+            profiler.mark("physics")  # only the interpolation bookkeeping; the engine reported the steps themselves
+
+            # Shots, positions and rests from the other player
+            online = False
+            if session is not None:
+                for event in session.poll():
+                    if event[0] == "shot" and (session.is_host() or session.get_sync() == "resim"):
+                        if game.take_shot(event[2], event[3]) and session.is_host():
+                            session.send_shot(event[2], event[3])  # the client's shot, echoed once it is played
+                    elif event[0] == "positions" and session.is_moving():
+                        session.follow(event[1], event[2])
+                    elif event[0] == "rest" and event[2] is not None:
+                        # The host's exact table replaces whatever the client simulated or followed
+                        returned = game.restore(event[2])
+                        allSpritesBalls.add(returned)
+                        allSpritesDirty.add(returned, layer=1)
+                        shot = None  # cue and guide are refreshed below
+                online = session.is_connected()  # False plays alone, e.g. while the host waits for a player
+                if online:
+                    undo_snapshot = None
+                    if session.is_moving():
+                        alpha = session.get_alpha()  # Interpolated between the host's position updates
+                caption = "your turn" if session.is_my_turn() else "their turn"
+                if not online:
+                    caption = "waiting for a player" if session.is_host() else "disconnected"
+                if caption != last_caption:
+                    pygame.display.set_caption("8 Ball Pool - " + caption)
+                    last_caption = caption
+
+            # Game Over condition check
+            if game.is_over():
+                over = True
+
+            # Every queued event is read once; mouse motion is coalesced to the latest position
+            frame_input = controls.poll()
+
+            if frame_input.quit:
+                keepGoing = False
 
-            if event.type == pygame.MOUSEBUTTONDOWN and shot:
+            for key in frame_input.keys:
+                if key == pygame.K_s:
+                    skip_animation = not skip_animation
+                elif key == pygame.K_f:
+                    timestep.set_speed(1 if timestep.get_speed() != 1 else fast_forward)
+                elif key == pygame.K_p:
+                    overlay.toggle()
+                elif key == pygame.K_g:
+                    show_guide = not show_guide
+                    aimGuide.visible = cue.visible and show_guide
+                elif key == pygame.K_u and undo_snapshot is not None:
+                    # Put the table back as it was before the last shot, balls potted since come back
+                    returned = game.restore(undo_snapshot)
+                    undo_snapshot = None
+                    allSpritesBalls.add(returned)
+                    allSpritesDirty.add(returned, layer=1)
+                    for p_ball in potted_balls_sprites[len(potted_balls):]:
+                        p_ball.kill()
+                    del potted_balls_sprites[len(potted_balls):]
+                    ai_turn = False  # the undone shot was the player's
+                    shot = None  # cue and guide are refreshed below
+
+            # Bottom bar sprites for any balls potted this frame
+            while len(potted_balls_sprites) < len(potted_balls):
+                n = len(potted_balls_sprites)
+                potted_balls_sprites.append(ball8_sprites.BottomBarBalls(n, potted_balls[n], screen_h))
+                allSpritesPottedBalls.add(potted_balls_sprites[-1])
+                allSpritesDirty.add(potted_balls_sprites[-1], layer=1)
+
+            at_rest = game.is_at_rest() and not (online and session.is_moving())
+            if shot != at_rest:
+                shot = at_rest
+                cue.set_position(balls[-1].get_position())
+                aimGuide.invalidate()  # The balls have moved since the guide was traced
+
+            # Only show the cue once every ball has stopped, and only on the player's own turn
+            my_turn = shot and not ai_turn and (not online or session.is_my_turn())
+            if cue.visible != my_turn:
+                cue.visible = my_turn
+                aimGuide.visible = my_turn and show_guide
+                if not my_turn:
+                    power = False  # a shot being charged is dropped if the turn goes, e.g. on a disconnect
+                    cue.force_zero()
+                    cue.change_force_direction()
+
+            # The computer shoots once the table is at rest (the window waits while it thinks)
+            if ai_turn and shot and not over:
+                ai.take_turn(game)
+                shotSound.play()
+                ai_turn = False
+                if skip_animation:
+                    profiler.mark("input")
+                    game.resolve_shot()
+                    profiler.mark("physics")
+                shot = None  # cue and guide come back once the balls stop
+                clock.tick()  # Thinking time is not fed to the physics
 
+            # Cue rotation based on mouse movement
+            if frame_input.mouse_pos is not None:
+                profiler.mark("input")
+                mouse_pos = view.to_logical(frame_input.mouse_pos)  # screen pixels to table coordinates
+                cue_angle = cue.update(mouse_pos, balls[-1].get_position()) # rotates the cue image
+                profiler.mark("cue")
+
+            # Aim guide follows the cue; only a new angle bucket or a changed table costs anything
+            if aimGuide.visible:
+                profiler.mark("input")
+                aimGuide.update(cue_angle)
+                profiler.mark("cue")
+
+            # Start charging power when mouse pressed, power grows with real time while it is held
+            if frame_input.button_down and my_turn:
                 power = True
-
-                cue.increase_force()
-
-                # Draw power bars based on force
-
-                for force in range(math.ceil(cue.get_force() / 2000)):
-                    screen.blit(
-                        powerBar.image,
-                        (balls[-1].get_position()[0] - 30 + (force * 15),
-                         balls[-1].get_position()[1] + 30)
-                    )
+            if power and frame_input.held:
+                cue.increase_force(frame_ms / 1000)
 
             # Release shot when mouse released
-
-            if event.type == pygame.MOUSEBUTTONUP and power and shot:
-                shotSound.play()
+            if frame_input.button_up and power and my_turn:
                 power = False
-                balls[-1].apply_impulse(cue.get_force(), cue_angle)
+                if not online:
+                    undo_snapshot = game.snapshot()
+                    game.take_shot(cue_angle, cue.get_force())
+                    shotSound.play()
+                    ai_turn = ai is not None
+                elif not session.is_host() or game.take_shot(cue_angle, cue.get_force()):
+                    session.send_shot(cue_angle, cue.get_force())  # a client's shot is played when the host echoes it
+                    shotSound.play()
+                if skip_animation and not online:
+                    profiler.mark("input")
+                    game.resolve_shot()
+                    profiler.mark("physics")
+                    cue.set_position(balls[-1].get_position())
                 cue.force_zero()
                 cue.change_force_direction()
-                label1.increase_score()
-
-        # Draw all balls
-        allSpritesBalls.update()
-        allSpritesBalls.draw(screen)
 
-        if shot:
-            if cueball_ispotted:
-                # Reset cue ball position after being potted
-                balls[-1].set_body_position((888, screen_h // 2))
-                cueball_ispotted = False
-                label1.decrease_lives()
-            cue.draw(screen)
+            profiler.mark("input")
 
-        # Bottom Panel
-        allSpritesBottomPanel.clear(screen, background)
-        allSpritesBottomPanel.update()
-        allSpritesBottomPanel.draw(screen)
+            # Move the balls and power bar blocks (power bar is based on force)
+            allSpritesBalls.update(alpha)  # Drawn between the last two physics states
+            powerBar.update(cue.get_force(), balls[-1].get_position())
 
-        # Potted balls bar
-        allSpritesPottedBalls = pygame.sprite.Group(potted_balls_sprites)
-        allSpritesPottedBalls.clear(screen, background)
-        allSpritesPottedBalls.update()
-        allSpritesPottedBalls.draw(screen)
+            # Labels (re-rendered only when lives or score change)
+            allSpritesLabels.update()
+            overlay.update()
+            profiler.mark("sprites")
 
-        # Labels
-        allSpritesLabels.clear(screen, background)
-        allSpritesLabels.update()
-        allSpritesLabels.draw(screen)
+            # Redraw and push to the display only the regions that changed this frame
+            dirty_rects = allSpritesDirty.draw(screen)
+            profiler.mark("draw")
+            pygame.display.update(dirty_rects)
+            profiler.mark("flip")
+            profiler.end_frame()
 
-    else:
+            if over:
+                # Show the end screen once; nothing else is drawn after it
+                if game.is_won():
+                    screen.blit(assets.get_scaled("gameWin.png", (1200, 678)), (0, 0))
+                else:
+                    screen.blit(assets.get_scaled("gameOver.png", (1200, 678)), (0, 0))
+                pygame.display.flip()
 
-        # ==============================
-        #         GAME OVER SCREEN
-        # ==============================
-
-        pygame.mixer.music.fadeout(1)
-
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
-                    keepGoing = False
+        else:
 
-        if len(balls) == 1:
-            background = pygame.image.load("gameWin.png")
-            background = pygame.transform.scale(background, (1200, 678))
-            screen.blit(background, (0, 0))
+            # ==============================
+            #         GAME OVER SCREEN
+            # ==============================
 
-        elif label1.get_lives() == 0:
-            background = pygame.image.load("gameOver.png")
-            background = pygame.transform.scale(background, (1200, 678))
-            screen.blit(background, (0, 0))
+            pygame.mixer.music.fadeout(1)
 
-    pygame.display.flip()
+            frame_input = controls.poll()
+            if frame_input.quit or pygame.K_q in frame_input.keys:
+                keepGoing = False
 
-pygame.display.quit()
-pygame.quit()
+            elif pygame.K_r in frame_input.keys and (session is None or not session.is_connected()):
+                # Rematch: the same balls, sprites, images and sounds are reused, only the table is re-racked
+                returned = game.reset()
+                allSpritesBalls.add(returned)
+                allSpritesDirty.add(returned, layer=1)
+                for p_ball in potted_balls_sprites:
+                    p_ball.kill()
+                del potted_balls_sprites[:]
+                undo_snapshot = None
+                ai_turn = False
+                power = False
+                cue.force_zero()
+                cue.change_force_direction()
+                aimGuide.invalidate()
+                shot = None  # cue and guide are shown again on the first frame
+                timestep.reset()
+
+                # Paint over the end screen, then carry on with dirty regions
+                screen.blit(background, (0, 0))
+                pygame.display.flip()
+                allSpritesDirty.repaint_rect(screen.get_rect())
+                pygame.mixer.music.play(-1)
+                clock.tick()  # Time spent on the end screen is not fed to the physics
+                over = False
+
+            clock.tick(30)
+
+    if session is not None:
+        session.close()
+    if ai is not None:
+        ai.close()
+    if recorder is not None:
+        recorder.close()
+    if telemetry is not None:
+        telemetry.close()
+    profiler.close_csv()
+
+    pygame.display.quit()
+    pygame.quit()
 
 
 
@@ -0,0 +1,161 @@
+"""
+===================================================================================================================
+|  Name: Safiya                                                                                                    |
+|  Date: October 16th, 2026                                                                                        |
+|  Description: Computer Player File for 8-Ball Video Game                                                         |
+|               Samples candidate shots and plays each one on its own headless table in a process pool            |
+|               Contains functions simulate_shot and score_outcome, and class AIPlayer                             |
+===================================================================================================================
+"""
+
+# =========================================== IMPORTS AND INITIALIZATION ===========================================
+
+import concurrent.futures
+import math
+import os
+import random
+import time
+import ball8_engine
+import ball8_sprites
+
+# Candidates sampled per turn, aiming error (degrees) and shots tried per object ball for each difficulty
+DIFFICULTIES = {
+    "easy": {"candidates": 16, "aim_error": 4.0, "per_ball": 1},
+    "medium": {"candidates": 48, "aim_error": 1.5, "per_ball": 2},
+    "hard": {"candidates": 128, "aim_error": 0.25, "per_ball": 4},
+}
+
+TABLE_CENTRE = (ball8_engine.SCREEN_W / 2, ball8_engine.SCREEN_H / 2)
+
+
+# ============================================== SIMULATION =======================================================
+
+def simulate_shot(layout, lives, angle, force, friction="pivot", rack="8ball", ball_count=None):
+
+    """
+    Plays one shot on a fresh headless table of the same rack arranged like layout and reports what happened.
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+
+    game = ball8_engine.GameState(lives=lives, rack=rack, ball_count=ball_count, friction=friction)
+    game.set_layout(layout)
+    balls_before = len(game.get_balls())
+    steps = game.play_shot(angle, force)
+    cue_pos = game.get_cue_ball().get_position()
+    return {
+        "angle": angle,
+        "force": force,
+        "potted": balls_before - len(game.get_balls()),
+        "scratch": game.get_lives() < lives,
+        "cue_pos": (cue_pos[0], cue_pos[1]),
+        "steps": steps,
+    }
+
+
+def score_outcome(outcome):
+
+    """
+    Rates a simulated shot: potting is worth the most, a scratch costs more than one pot,
+    and leaving the cue ball near the middle of the table is a small bonus.
+    """
+
+    score = outcome["potted"] * 100.0
+    if outcome["scratch"]:
+        score -= 150.0
+    else:
+        centre_dist = math.hypot(outcome["cue_pos"][0] - TABLE_CENTRE[0], outcome["cue_pos"][1] - TABLE_CENTRE[1])
+        score -= centre_dist / 20.0
+    return score
+
+
+def aim_angle(cue_pos, target_pos):
+
+    """
+    Returns the cue angle that sends the cue ball straight at target_pos (same convention as Cue.update).
+    """
+
+    return math.degrees(math.atan2(target_pos[1] - cue_pos[1], -(target_pos[0] - cue_pos[0])))
+
+
+# ================================================ AI PLAYER =======================================================
+
+class AIPlayer():
+
+    """
+    Computer opponent. Every turn it samples (cue angle, force) pairs, simulates each one on its own
+    copy of the table in a process pool (one worker per core) and keeps the best scoring shot found
+    within the time budget. Shots go through GameState.take_shot, so they behave like human shots.
+    """
+
+    def __init__(self, difficulty="medium", time_budget=2.0, workers=None, seed=None):
+        self.__settings = DIFFICULTIES[difficulty]
+        self.__time_budget = time_budget
+        self.__random = random.Random(seed)
+        self.__executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+
+    def __candidates(self, game):
+        cue_pos = game.get_cue_ball().get_position()
+        max_force = ball8_sprites.Cue.MAX_FORCE
+        candidates = []
+
+        # Straight at each object ball, at a few strengths
+        for ball in game.get_balls()[:-1]:
+            angle = aim_angle(cue_pos, ball.get_position())
+            for i in range(self.__settings["per_ball"]):
+                candidates.append((angle + self.__random.uniform(-2.0, 2.0), self.__random.uniform(0.3, 1.0) * max_force))
+
+        self.__random.shuffle(candidates)
+        candidates = candidates[:self.__settings["candidates"]]
+
+        # Fill the rest of the budget with random shots
+        while len(candidates) < self.__settings["candidates"]:
+            candidates.append((self.__random.uniform(-180.0, 180.0), self.__random.uniform(0.2, 1.0) * max_force))
+        return candidates
+
+    def choose_shot(self, game):
+
+        """
+        Returns the (cue angle, force) of the best shot found for the current table,
+        with the difficulty's aiming error applied.
+        """
+
+        deadline = time.monotonic() + self.__time_budget
+        layout = game.get_layout()
+        futures = []
+        for angle, force in self.__candidates(game):
+            futures.append(self.__executor.submit(simulate_shot, layout, game.get_lives(), angle, force,
+                                                  game.get_friction(), game.get_rack(), game.get_ball_count()))
+
+        best = None
+        best_score = None
+        try:
+            for future in concurrent.futures.as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                outcome = future.result()
+                score = score_outcome(outcome)
+                if best is None or score > best_score:
+                    best = outcome
+                    best_score = score
+        except concurrent.futures.TimeoutError:
+            pass  # Out of time: go with the best shot simulated so far
+        finally:
+            for future in futures:
+                future.cancel()
+
+        if best is None:
+            angle, force = aim_angle(game.get_cue_ball().get_position(), TABLE_CENTRE), ball8_sprites.Cue.MAX_FORCE / 2
+        else:
+            angle, force = best["angle"], best["force"]
+        return angle + self.__random.gauss(0.0, self.__settings["aim_error"]), force
+
+    def take_turn(self, game):
+
+        """
+        Chooses a shot and takes it on the live game; returns the (cue angle, force) played.
+        """
+
+        angle, force = self.choose_shot(game)
+        game.take_shot(angle, force)
+        return angle, force
+
+    def close(self):
+        self.__executor.shutdown(cancel_futures=True)
@@ -0,0 +1,288 @@
+"""
+===================================================================================================================
+|  Name: Safiya                                                                                                    |
+|  Date: October 16th, 2026                                                                                        |
+|  Description: Asset File for 8-Ball Video Game                                                                   |
+|               Loads, converts and scales every image, sound and font once and hands out the shared copies,       |
+|               optionally keeping decoded images and sounds in a disk cache between launches                      |
+|               Contains classes Viewport, AssetCache and AssetLoader and the shared instances view and assets     |
+===================================================================================================================
+"""
+
+# =========================================== IMPORTS AND INITIALIZATION ===========================================
+
+import os
+import struct
+import threading
+import pygame
+
+# Sizes are logical: the game is laid out on a 1200x758 window and the Viewport scales it to the screen
+BALL_SIZE = (36, 36)      # Size of the ball images on disk
+BAR_BALL_SIZE = (36, 36)  # Size of the potted-ball icons in the bottom bar
+CUE_SIZE = (1100, 10)
+TABLE_SIZE = (1200, 678)
+WINDOW_SIZE = (1200, 758)
+
+SOUNDS = {"shot.mp3": 0.2, "potted.mp3": 1.0}  # Sound effects and their volumes
+LABEL_FONT = ("georgia", 25)                   # Scaled with the table
+OVERLAY_FONT = ("couriernew", 14)              # Profiler overlay, always in screen pixels
+
+# Disk cache entries: magic, source file modification time, then the width and height of an image
+# or the mixer frequency, sample format and channel count of a sound, followed by the raw pixels/samples
+CACHE_HEADER = struct.Struct("<4sdiii")
+IMAGE_MAGIC = b"8BIM"
+SOUND_MAGIC = b"8BSN"
+
+
+# ================================================ VIEWPORT =======================================================
+
+class Viewport():
+
+    """
+    Maps logical coordinates (the 1200x758 window the physics, cushions and pockets are laid out in)
+    to screen pixels with one uniform scale, so the game can run natively at any resolution.
+    """
+
+    def __init__(self, scale=1.0):
+        self.__scale = scale
+
+    def set_scale(self, scale):
+        self.__scale = scale
+
+    def set_resolution(self, size):
+
+        """
+        Picks the largest scale at which the whole logical window fits in size (e.g. (1280, 720)).
+        """
+
+        self.__scale = min(size[0] / WINDOW_SIZE[0], size[1] / WINDOW_SIZE[1])
+
+    def get_scale(self):
+        return self.__scale
+
+    def get_screen_size(self):
+        return self.size(WINDOW_SIZE)
+
+    def length(self, n):
+        return max(1, round(n * self.__scale))
+
+    def size(self, size):
+        return (self.length(size[0]), self.length(size[1]))
+
+    def to_screen(self, pos):
+        return (round(pos[0] * self.__scale), round(pos[1] * self.__scale))
+
+    def to_logical(self, pos):
+        return (pos[0] / self.__scale, pos[1] / self.__scale)
+
+
+# ============================================== ASSET CACHE ======================================================
+
+class AssetCache():
+
+    """
+    Keeps one converted surface per (file, pixel size) so nothing is decoded or scaled twice, plus one
+    Sound per file and one Font per (name, size). preload() fills it for the view's current scale,
+    which is the game's whole asset set for that resolution.
+    Surfaces are converted to the display pixel format, so a display mode must be set first.
+    Entries are only ever added, so the cache can be filled from a loader thread while the main
+    thread reads it; at worst both threads decode the same file once.
+    """
+
+    def __init__(self):
+        self.__surfaces = {}
+        self.__sounds = {}
+        self.__fonts = {}
+        self.__disk_cache = None
+
+    def set_disk_cache(self, path):
+
+        """
+        Keeps decoded images and sounds as raw files under path, so later launches skip PNG and MP3 decoding.
+        Entries are rebuilt whenever the source file changes. None turns the disk cache off.
+        """
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        self.__disk_cache = path
+
+    def get_image(self, name, size=None):
+
+        """
+        Returns the shared surface for an image file, scaled to size if one is given.
+        """
+
+        key = (name, size)
+        if key not in self.__surfaces:
+            surface = self.__read_image(name, size)
+            if surface is None:
+                surface = pygame.image.load(name)
+                if size is not None and surface.get_size() != size:
+                    surface = pygame.transform.smoothscale(surface.convert_alpha(), size)
+                self.__write_image(name, size, surface)
+            self.__surfaces.setdefault(key, surface.convert_alpha())
+        return self.__surfaces[key]
+
+    def get_scaled(self, name, size):
+        # Image at a logical size, in screen pixels for the current view
+        return self.get_image(name, view.size(size))
+
+    def get_ball(self, imageName, size=BALL_SIZE):
+        return self.get_scaled(imageName, size)
+
+    def get_bar_ball(self, imageName):
+        return self.get_scaled(imageName, BAR_BALL_SIZE)
+
+    def get_sound(self, name, volume=None):
+
+        """
+        Returns the shared Sound for an audio file (the mixer must be initialised), at SOUNDS' volume by default.
+        """
+
+        if name not in self.__sounds:
+            sound = self.__read_sound(name)
+            if sound is None:
+                sound = pygame.mixer.Sound(name)
+                self.__write_sound(name, sound)
+            sound.set_volume(SOUNDS.get(name, 1.0) if volume is None else volume)
+            self.__sounds.setdefault(name, sound)
+        return self.__sounds[name]
+
+    def get_font(self, name, size):
+
+        """
+        Returns a shared system font. The first SysFont call can scan every installed font,
+        so preload() resolves the game's fonts ahead of time.
+        """
+
+        key = (name, size)
+        if key not in self.__fonts:
+            self.__fonts.setdefault(key, pygame.font.SysFont(name, size))
+        return self.__fonts[key]
+
+    def preload(self):
+
+        """
+        Loads every image, sound and font the game uses up front, pre-scaled for the current view and
+        including the bottom-bar ball variants, so nothing is read or scaled once the main loop is running.
+        """
+
+        for n in range(1, 17):
+            self.get_ball("ball_{}.png".format(n))
+            self.get_bar_ball("ball_{}.png".format(n))
+        self.get_scaled("cue.png", CUE_SIZE)
+        self.get_scaled("table.png", TABLE_SIZE)
+        self.get_scaled("start_screen.png", WINDOW_SIZE)
+        self.get_scaled("gameWin.png", TABLE_SIZE)
+        self.get_scaled("gameOver.png", TABLE_SIZE)
+        if pygame.mixer.get_init():
+            for name in SOUNDS:
+                self.get_sound(name)
+        if pygame.font.get_init():
+            self.get_font(LABEL_FONT[0], view.length(LABEL_FONT[1]))
+            self.get_font(*OVERLAY_FONT)
+
+    def clear(self):
+        self.__surfaces.clear()
+        self.__sounds.clear()
+        self.__fonts.clear()
+
+    # === Disk cache ===
+
+    def __cache_file(self, name, suffix):
+        return os.path.join(self.__disk_cache, "{}.{}".format(name.replace(os.sep, "_"), suffix))
+
+    def __read_entry(self, path, magic, source):
+        # Returns (header values, raw data) of a cache entry, or None if it is missing or older than its source
+        try:
+            with open(path, "rb") as f:
+                header = CACHE_HEADER.unpack(f.read(CACHE_HEADER.size))
+                if header[0] != magic or header[1] != os.path.getmtime(source):
+                    return None
+                return header[2:], f.read()
+        except (OSError, struct.error):
+            return None
+
+    def __write_entry(self, path, magic, source, values, data):
+        try:
+            temp = "{}.{}.tmp".format(path, threading.get_ident())
+            with open(temp, "wb") as f:
+                f.write(CACHE_HEADER.pack(magic, os.path.getmtime(source), *values))
+                f.write(data)
+            os.replace(temp, path)  # Readers never see a half written entry
+        except OSError:
+            pass  # The cache is only an optimisation
+
+    def __image_file(self, name, size):
+        if size is None:
+            return self.__cache_file(name, "rgba")
+        return self.__cache_file(name, "{}x{}.rgba".format(*size))
+
+    def __read_image(self, name, size):
+        if self.__disk_cache is None:
+            return None
+        entry = self.__read_entry(self.__image_file(name, size), IMAGE_MAGIC, name)
+        if entry is None:
+            return None
+        (width, height, unused), data = entry
+        return pygame.image.frombytes(data, (width, height), "RGBA")
+
+    def __write_image(self, name, size, surface):
+        if self.__disk_cache is not None:
+            width, height = surface.get_size()
+            self.__write_entry(self.__image_file(name, size), IMAGE_MAGIC, name, (width, height, 0),
+                               pygame.image.tobytes(surface, "RGBA"))
+
+    def __read_sound(self, name):
+        if self.__disk_cache is None:
+            return None
+        entry = self.__read_entry(self.__cache_file(name, "pcm"), SOUND_MAGIC, name)
+        if entry is None or entry[0] != pygame.mixer.get_init():
+            return None  # Decoded for a different mixer format
+        return pygame.mixer.Sound(buffer=entry[1])
+
+    def __write_sound(self, name, sound):
+        if self.__disk_cache is not None:
+            self.__write_entry(self.__cache_file(name, "pcm"), SOUND_MAGIC, name, pygame.mixer.get_init(), sound.get_raw())
+
+
+# ============================================== ASSET LOADER =====================================================
+
+class AssetLoader():
+
+    """
+    Runs AssetCache.preload() on a background thread, so the start screen can be shown
+    and answer events while the rest of the images, sounds and fonts are decoded.
+    """
+
+    def __init__(self, cache):
+        self.__cache = cache
+        self.__error = None
+        self.__thread = threading.Thread(target=self.__run, name="asset-loader", daemon=True)
+
+    def __run(self):
+        try:
+            self.__cache.preload()
+        except Exception as error:
+            self.__error = error  # Raised again on the main thread by wait()
+
+    def start(self):
+        self.__thread.start()
+        return self
+
+    def is_done(self):
+        return not self.__thread.is_alive()
+
+    def wait(self):
+
+        """
+        Blocks until everything is loaded, re-raising anything that went wrong on the loader thread.
+        """
+
+        self.__thread.join()
+        if self.__error is not None:
+            raise self.__error
+
+
+view = Viewport()      # Shared by every sprite and the main loop
+assets = AssetCache()
@@ -0,0 +1,263 @@
+"""
+===================================================================================================================
+|  Name: Safiya                                                                                                    |
+|  Date: October 16th, 2026                                                                                        |
+|  Description: Batch Runner File for 8-Ball Video Game                                                            |
+|               Plays thousands of seeded, randomised shots on headless tables across every core and streams       |
+|               pot rate, scratch rate, time to rest and histograms to JSON and CSV                                |
+|               Run: python ball8_batch.py --shots 10000 --json break.json --csv break.csv                         |
+|               Contains functions make_scenario and run_chunk, and class BatchStats                               |
+===================================================================================================================
+"""
+
+# =========================================== IMPORTS AND INITIALIZATION ===========================================
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # workers never open a window or an audio device
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout clean for the JSON report
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import math
+import random
+import sys
+import time
+import numpy
+import ball8_ai
+import ball8_engine
+import ball8_sprites
+
+CSV_FIELDS = ("shot", "angle", "force", "cue_x", "cue_y", "potted", "scratch", "steps", "time_to_rest", "capped")
+REST_BINS = numpy.arange(0.0, 20.5, 0.5)  # Simulated seconds to rest, half second buckets (the last one is open)
+CHUNK = 32                                 # Shots per task handed to a worker
+
+
+# ================================================ SCENARIOS =======================================================
+
+def make_scenario(settings, shot):
+
+    """
+    Returns the (cue ball position, cue angle, force) of one shot. Each shot draws from its own
+    generator seeded with (seed, shot), so results do not depend on how shots are split between workers.
+    """
+
+    rng = random.Random("{}-{}".format(settings["seed"], shot))
+    cue_x, cue_y = settings["cue_pos"]
+    if settings["cue_jitter"]:
+        cue_x += rng.uniform(-settings["cue_jitter"], settings["cue_jitter"])
+        cue_y += rng.uniform(-settings["cue_jitter"], settings["cue_jitter"])
+
+    if settings["aim"] is None:
+        angle = rng.uniform(-180.0, 180.0)
+    else:
+        angle = ball8_ai.aim_angle((cue_x, cue_y), settings["aim"]) + rng.uniform(-settings["spread"], settings["spread"])
+    force = rng.uniform(settings["force_min"], settings["force_max"])
+    return (cue_x, cue_y), angle, force
+
+
+_table = {}  # Per worker process: the settings key, GameState and snapshot of the starting rack
+
+
+def run_chunk(settings, first, count):
+
+    """
+    Plays shots first to first + count - 1 in this process and returns one result row per shot.
+    Every shot starts from the same rack, restored from a snapshot instead of rebuilding the space.
+    """
+
+    key = (settings["rack"], settings["friction"])
+    if _table.get("key") != key:
+        game = ball8_engine.GameState(rack=settings["rack"], friction=settings["friction"])
+        _table.update(key=key, game=game, start=game.snapshot())
+    game = _table["game"]
+
+    rows = []
+    for shot in range(first, first + count):
+        cue_pos, angle, force = make_scenario(settings, shot)
+        game.restore(_table["start"])
+        game.get_cue_ball().set_body_position(cue_pos)
+        lives = game.get_lives()
+        on_table = len(game.get_balls())
+        steps = game.play_shot(angle, force)
+        rows.append({
+            "shot": shot,
+            "angle": angle,
+            "force": force,
+            "cue_x": cue_pos[0],
+            "cue_y": cue_pos[1],
+            "potted": on_table - len(game.get_balls()),
+            "scratch": game.get_lives() < lives,
+            "steps": steps,
+            "time_to_rest": steps * game.get_dt(),
+            "capped": not game.is_at_rest(),
+        })
+    return rows
+
+
+# ================================================ STATISTICS ======================================================
+
+class BatchStats():
+
+    """
+    Running totals for a batch: pot and scratch rates, time to rest and histograms.
+    Rows can arrive in any order; every total is order independent.
+    """
+
+    def __init__(self, object_balls):
+        self.__shots = 0
+        self.__potted = 0
+        self.__scratches = 0
+        self.__capped = 0
+        self.__rest_sum = 0.0
+        self.__rest_sq_sum = 0.0
+        self.__rest_max = 0.0
+        self.__potted_hist = numpy.zeros(object_balls + 1, dtype=numpy.int64)
+        self.__rest_hist = numpy.zeros(len(REST_BINS), dtype=numpy.int64)
+
+    def add(self, row):
+        self.__shots += 1
+        self.__potted += row["potted"]
+        self.__scratches += row["scratch"]
+        self.__capped += row["capped"]
+        self.__rest_sum += row["time_to_rest"]
+        self.__rest_sq_sum += row["time_to_rest"] ** 2
+        self.__rest_max = max(self.__rest_max, row["time_to_rest"])
+        self.__potted_hist[min(row["potted"], len(self.__potted_hist) - 1)] += 1
+        self.__rest_hist[min(int(row["time_to_rest"] / REST_BINS[1]), len(REST_BINS) - 1)] += 1
+
+    def get_shots(self):
+        return self.__shots
+
+    def summary(self):
+
+        """
+        Returns the aggregate statistics as plain JSON-ready data.
+        """
+
+        shots = max(1, self.__shots)
+        mean_rest = self.__rest_sum / shots
+        return {
+            "shots": self.__shots,
+            "pot_rate": int(self.__potted_hist[1:].sum()) / shots,  # shots that potted at least one ball
+            "balls_potted_mean": self.__potted / shots,
+            "scratch_rate": self.__scratches / shots,
+            "capped_shots": self.__capped,
+            "time_to_rest": {
+                "mean": mean_rest,
+                "stdev": math.sqrt(max(0.0, self.__rest_sq_sum / shots - mean_rest ** 2)),
+                "max": self.__rest_max,
+            },
+            "potted_histogram": self.__potted_hist.tolist(),
+            "time_to_rest_histogram": {
+                "bin_seconds": float(REST_BINS[1]),
+                "counts": self.__rest_hist.tolist(),
+            },
+        }
+
+
+# ================================================== MAIN =========================================================
+
+def parse_point(text):
+    x, y = text.split(",")
+    return (float(x), float(y))
+
+
+def write_json(path, report):
+    # Replaced in one step, so anything watching the file never reads half a report
+    temp = path + ".tmp"
+    with open(temp, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    os.replace(temp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play many randomised shots without rendering and report statistics.")
+    parser.add_argument("--shots", type=int, default=1000, help="number of shots to play")
+    parser.add_argument("--seed", type=int, default=1, help="base seed; the same seed always gives the same shots")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--rack", default="8ball", choices=ball8_engine.RACKS)
+    parser.add_argument("--friction", default="pivot", choices=ball8_sprites.FRICTION_MODES)
+    parser.add_argument("--force", type=float, default=None, help="fixed force instead of a random one")
+    parser.add_argument("--force-min", type=float, default=0.1 * ball8_sprites.Cue.MAX_FORCE)
+    parser.add_argument("--force-max", type=float, default=ball8_sprites.Cue.MAX_FORCE)
+    parser.add_argument("--cue-pos", type=parse_point, default=None, help="cue ball position as X,Y (default: the rack's)")
+    parser.add_argument("--cue-jitter", type=float, default=0.0, help="random offset of the cue ball, in pixels")
+    parser.add_argument("--aim", type=parse_point, default=None,
+                        help="point to aim at as X,Y (default: the nearest object ball)")
+    parser.add_argument("--random-aim", action="store_true", help="shoot in uniformly random directions")
+    parser.add_argument("--spread", type=float, default=2.0, help="random aiming error, in degrees either side")
+    parser.add_argument("--json", default="-", help="JSON summary, rewritten as results stream in (default: stdout at the end)")
+    parser.add_argument("--csv", default=None, help="CSV file with one row per shot")
+    args = parser.parse_args(argv)
+
+    # The starting rack decides the default cue position and aiming point
+    game = ball8_engine.GameState(rack=args.rack, friction=args.friction)
+    cue_pos = args.cue_pos or tuple(game.get_cue_ball().get_position())
+    aim = args.aim
+    if args.random_aim:
+        aim = None
+    elif aim is None:
+        nearest = min(game.get_balls()[:-1], key=lambda ball: ball.get_position().get_distance(cue_pos))
+        aim = tuple(nearest.get_position())
+    settings = {
+        "seed": args.seed,
+        "rack": args.rack,
+        "friction": args.friction,
+        "cue_pos": cue_pos,
+        "cue_jitter": args.cue_jitter,
+        "aim": aim,
+        "spread": args.spread,
+        "force_min": args.force if args.force is not None else args.force_min,
+        "force_max": args.force if args.force is not None else args.force_max,
+    }
+
+    workers = args.workers or os.cpu_count()
+    stats = BatchStats(len(game.get_balls()) - 1)
+    csv_file = None
+    writer = None
+    if args.csv is not None:
+        csv_file = open(args.csv, "w", newline="")
+        writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+    def report(elapsed):
+        return {
+            "settings": settings,
+            "workers": workers,
+            "elapsed_seconds": elapsed,
+            "shots_per_second": stats.get_shots() / elapsed if elapsed else 0.0,
+            "done": stats.get_shots() == args.shots,
+            "stats": stats.summary(),
+        }
+
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for first in range(0, args.shots, CHUNK):
+            futures.append(executor.submit(run_chunk, settings, first, min(CHUNK, args.shots - first)))
+        for future in concurrent.futures.as_completed(futures):
+            rows = future.result()
+            for row in rows:
+                stats.add(row)
+            if writer is not None:
+                writer.writerows(rows)
+                csv_file.flush()
+            if args.json != "-":
+                write_json(args.json, report(time.perf_counter() - start))
+
+    if csv_file is not None:
+        csv_file.close()
+    final = report(time.perf_counter() - start)
+    if args.json == "-":
+        json.dump(final, sys.stdout, indent=2)
+        print()
+    else:
+        write_json(args.json, final)
+
+
+if __name__ == "__main__":
+    main()
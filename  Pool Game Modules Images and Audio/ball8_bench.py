@@ -0,0 +1,270 @@
+"""
+===================================================================================================================
+|  Name: Safiya                                                                                                    |
+|  Date: October 16th, 2026                                                                                        |
+|  Description: Benchmark File for 8-Ball Video Game                                                               |
+|               Times physics, pocket detection, rendering and startup with no real window or audio device         |
+|               Run: python ball8_bench.py --output bench.json                                                     |
+===================================================================================================================
+"""
+
+# =========================================== IMPORTS AND INITIALIZATION ===========================================
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # must be set before pygame opens a display
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout clean for the JSON report
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import numpy
+import pygame
+import pymunk
+import ball8_ai
+import ball8_engine
+import ball8_sprites
+from ball8_assets import assets, view
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def timed(func, repeat, number=1):
+
+    """
+    Runs func number times per sample, repeat samples, and returns per-call seconds (best and median).
+    """
+
+    samples = []
+    for r in range(repeat):
+        start = time.perf_counter()
+        for n in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {"best": min(samples), "median": statistics.median(samples), "repeat": repeat, "number": number}
+
+
+# ================================================ PHYSICS =========================================================
+
+def bench_physics(repeat, friction="pivot"):
+
+    """
+    Physics steps per second while the standard 15-ball break from 8ball_main.py plays out.
+    """
+
+    game = ball8_engine.GameState(friction=friction)
+    start_state = game.snapshot()
+    rack_centre = game.get_balls()[7].get_position()
+    cue_pos = game.get_cue_ball().get_position()
+    angle = ball8_ai.aim_angle(cue_pos, rack_centre)
+
+    rates = []
+    steps = 0
+    for r in range(repeat):
+        game.restore(start_state)
+        start = time.perf_counter()
+        steps = game.play_shot(angle, ball8_sprites.Cue.MAX_FORCE)
+        rates.append(steps / (time.perf_counter() - start))
+    return {"steps_per_break": steps, "steps_per_second_best": max(rates), "steps_per_second_median": statistics.median(rates)}
+
+
+# ================================================= POCKETS ========================================================
+
+def bench_pockets(repeat, counts):
+
+    """
+    Cost of one physics step (space.step plus Pockets.if_potted) against the number of balls on the table,
+    with and without the pocket sensors, so the difference is what pocket detection costs per step.
+    Balls sit on the stress rack's grid and are never put to sleep, so every one is tested every step.
+    """
+
+    results = {}
+    for count in counts:
+        layout, cue_pos, ball_dia = ball8_engine.rack_layout("stress", count)
+        result = {}
+        for name, with_pockets in (("without_pockets", False), ("with_pockets", True)):
+            space = pymunk.Space()
+            balls = []
+            for n, (image, pos) in enumerate(layout):
+                balls.append(ball8_sprites.Ball(ball_dia / 2, pos, space, space.static_body, image, True, n + 1))
+            if with_pockets:
+                pockets = ball8_sprites.Pockets(None, space, ball_dia / 2)
+                potted = []
+
+                def step():
+                    space.step(1 / 120)
+                    pockets.if_potted(balls, space, potted, False)
+            else:
+                def step():
+                    space.step(1 / 120)
+            result[name] = timed(step, repeat, 200)
+        results[str(count)] = result
+    return results
+
+
+# ================================================= RENDER =========================================================
+
+class _Scores():
+
+    """
+    Stand-in for GameState that Label can read, with a score that can be bumped to force a re-render.
+    """
+
+    def __init__(self):
+        self.score = 0
+
+    def get_lives(self):
+        return 5
+
+    def get_score(self):
+        return self.score
+
+
+def bench_render(repeat, scale=1.0):
+
+    """
+    Per-frame cost of drawing the table, the balls, the cue (Cue.draw) and the HUD (Label.update),
+    with every asset pre-scaled for the given view scale.
+    """
+
+    view.set_scale(scale)
+    screen = pygame.display.set_mode(view.get_screen_size())
+    pygame.font.init()  # for the Label, nothing imported initialises pygame any more
+    assets.preload()
+    game = ball8_engine.GameState(headless=False)
+    table = pygame.sprite.Group(ball8_sprites.PoolTable())
+    balls = pygame.sprite.Group(game.get_balls())
+    cue = ball8_sprites.Cue(game.get_cue_ball().get_position())
+    scores = _Scores()
+    label = ball8_sprites.Label(scores, (600, 738))
+
+    angles = [(600 + 400 * numpy.cos(a), 339 + 300 * numpy.sin(a)) for a in numpy.linspace(0, 2 * numpy.pi, 97)]
+    state = {"i": 0}
+
+    def aim_and_draw():
+        state["i"] = (state["i"] + 1) % len(angles)
+        cue.update(angles[state["i"]], game.get_cue_ball().get_position())
+        cue.draw(screen)
+
+    def still_cue():
+        cue.draw(screen)
+
+    def label_changed():
+        scores.score += 1
+        label.update()
+
+    return {
+        "table": timed(lambda: table.draw(screen), repeat, 50),
+        "balls": timed(lambda: (balls.update(), balls.draw(screen)), repeat, 200),
+        "cue_still": timed(still_cue, repeat, 200),
+        "cue_moving": timed(aim_and_draw, repeat, 97),
+        "label_unchanged": timed(label.update, repeat, 1000),
+        "label_changed": timed(label_changed, repeat, 200),
+        "full_frame_flip": timed(pygame.display.flip, repeat, 50),
+    }
+
+
+# ================================================= STARTUP ========================================================
+
+STARTUP_PROBE = """
+import os, sys, time, runpy, pygame, ball8_assets
+start = float(sys.argv[1])
+presented = []
+def frame(*args):
+    presented.append(time.time() - start)
+    if len(presented) == 2:  # the start screen, then the table once SPACE has been pressed
+        print(presented[0], presented[1])
+        sys.stdout.flush()
+        os._exit(0)
+def press_space(*args, **kwargs):
+    return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+if len(sys.argv) > 2:
+    set_disk_cache = ball8_assets.AssetCache.set_disk_cache
+    ball8_assets.AssetCache.set_disk_cache = lambda cache, path: set_disk_cache(cache, sys.argv[2])
+pygame.display.flip = frame
+pygame.display.update = frame
+pygame.event.get = press_space
+runpy.run_path("8ball_main.py", run_name="__main__")
+"""
+
+
+def bench_startup(repeat, cache_dir=None):
+
+    """
+    Wall time from launching 8ball_main.py in a fresh interpreter to the start screen (first_frame)
+    and to the table being drawn when SPACE is pressed straight away (table_ready).
+    With cache_dir the game uses that asset disk cache, which the first launch fills.
+    """
+
+    first = []
+    ready = []
+    extra = [] if cache_dir is None else [os.path.abspath(cache_dir)]
+    for r in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE, repr(time.time())] + extra,
+            cwd=HERE, capture_output=True, text=True, timeout=120,
+        )
+        times = out.stdout.strip().splitlines()[-1].split()
+        first.append(float(times[0]))
+        ready.append(float(times[1]))
+    return {
+        "first_frame": {"best": min(first), "median": statistics.median(first)},
+        "table_ready": {"best": min(ready), "median": statistics.median(ready)},
+        "repeat": repeat,
+        "asset_cache": cache_dir is not None,
+    }
+
+
+# ================================================== MAIN =========================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the 8-ball physics, pocketing, rendering and startup.")
+    parser.add_argument("--output", default="-", help="JSON file to write (default: stdout)")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per measurement")
+    parser.add_argument("--ball-counts", default="16,64,256,1024", help="ball counts for the pocket benchmark")
+    parser.add_argument("--friction", default="pivot", choices=ball8_sprites.FRICTION_MODES,
+                        help="table friction model for the physics benchmark")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="view scale for the render benchmark (0.95 is 720p, 2.85 is 4K)")
+    parser.add_argument("--skip-startup", action="store_true", help="do not launch the game to time startup")
+    parser.add_argument("--asset-cache", default=None, help="asset disk cache folder for the startup benchmark")
+    args = parser.parse_args(argv)
+
+    os.chdir(HERE)  # images and sounds are loaded by relative path
+    results = {
+        "physics": bench_physics(args.repeat, args.friction),
+        "pockets": bench_pockets(args.repeat, [int(c) for c in args.ball_counts.split(",")]),
+        "render": bench_render(args.repeat, args.render_scale),
+    }
+    if not args.skip_startup:
+        results["startup"] = bench_startup(args.repeat, args.asset_cache)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pygame": pygame.version.ver,
+            "pymunk": pymunk.version,
+            "numpy": numpy.__version__,
+            "video_driver": os.environ["SDL_VIDEODRIVER"],
+            "friction": args.friction,
+            "render_scale": args.render_scale,
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
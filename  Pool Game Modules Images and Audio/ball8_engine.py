@@ -0,0 +1,583 @@
+"""
+===================================================================================================================
+|  Name: Safiya                                                                                                    |
+|  Date: October 16th, 2026                                                                                        |
+|  Description: Engine File for 8-Ball Video Game                                                                  |
+|               Owns the physics space, rack, pockets, lives and score with no display required                   |
+|               Contains rack generation (rack_layout, build_rack) and classes GameState and FixedTimestep         |
+===================================================================================================================
+"""
+
+# =========================================== IMPORTS AND INITIALIZATION ===========================================
+
+import math
+import time
+import numpy
+import pymunk
+import pymunk.batch
+import ball8_sprites
+
+SCREEN_W = 1200
+SCREEN_H = 678
+BALL_DIA = 36                       # Diameter of each ball
+CUE_BALL_POS = (888, SCREEN_H / 2)  # Where the cue ball starts and is re-spotted after a scratch
+STEP_DT = 1 / 120                   # Physics step length in seconds
+REST_SPEED = 0.1                    # Balls slower than this are idle and may be put to sleep
+SLEEP_TIME = 0.2                    # Seconds a ball must stay idle before pymunk puts it to sleep
+MAX_SHOT_STEPS = 120 * 60           # Safety cap on how long one shot may be simulated
+AIM_LENGTH = 1500                   # How far an aim trace looks, longer than the table diagonal
+SNAPSHOT_HEADER = 4                 # lives, score, cue ball potted flag, at rest flag
+SNAPSHOT_BALL = 7                   # pot order (0 = on table), x, y, vx, vy, angle, angular velocity
+LIVES = 5
+DAMPING_DECEL = 2000.0              # "damping" friction: speed (px/s) a rolling ball loses every second, the same
+                                    # as a pivot joint's 10000 max force on a mass 5 ball
+DAMPING_NUMPY_MIN = 64              # "damping" friction: from this many bodies velocities are slowed with numpy
+
+
+# ================================================== RACK =========================================================
+
+RACKS = ("8ball", "9ball", "snooker", "stress")
+SPATIAL_HASH_MIN = 256              # From this many balls the space switches to a spatial hash broad-phase
+PLAY_AREA = (77, 77, 1122, 600)     # Inside edges of the cushions (left, top, right, bottom)
+
+# Snooker colours drawn with the closest pool ball art: yellow, green, brown, blue, pink, black
+SNOOKER_RED = 3
+SNOOKER_COLOURS = [(1, (888, 439)), (6, (888, 239)), (7, (888, 339)), (2, (600, 339)), (4, (440, 339)), (8, (130, 339))]
+SNOOKER_CUE_POS = (950, 380)
+
+
+def triangle(rows, x0, y0, ball_dia):
+
+    """
+    Positions for a triangular rack with rows balls in its first column, apex pointing at the cue ball.
+    x moves right by one ball per column, y is staggered by half a ball per column to form the triangle.
+    """
+
+    positions = []
+    for col in range(rows):
+        for row in range(rows - col):
+            positions.append((x0 + (col * (ball_dia + 1)), y0 + (row * (ball_dia + 1)) + (col * (ball_dia / 2))))
+    return positions
+
+
+def rack_layout(rack="8ball", ball_count=None, ball_dia=BALL_DIA):
+
+    """
+    Returns (object balls as (image number, position), cue ball position, ball diameter) for a rack.
+    ball_count is only used by the stress rack, whose balls shrink if that many would not fit.
+    """
+
+    if rack == "8ball":
+        positions = triangle(5, 250, 267, ball_dia)
+        return [(i + 1, pos) for i, pos in enumerate(positions)], CUE_BALL_POS, ball_dia
+
+    if rack == "9ball":
+        # Diamond of 1, 2, 3, 2, 1 balls: the 1 ball at the apex facing the cue ball, the 9 in the middle
+        step = ball_dia + 1
+        positions = []
+        for col, size in enumerate((1, 2, 3, 2, 1)):
+            for row in range(size):
+                positions.append((250 + col * step * 0.87, SCREEN_H / 2 + (row - (size - 1) / 2) * step))
+        apex = positions.pop()
+        centre = positions.pop(4)  # middle of the three-ball column
+        balls = [(1, apex)] + [(n + 2, pos) for n, pos in enumerate(positions)] + [(9, centre)]
+        return balls, CUE_BALL_POS, ball_dia
+
+    if rack == "snooker":
+        # 15 reds just behind the pink, colours on their spots
+        reds = triangle(5, 250, SCREEN_H / 2 - 2 * (ball_dia + 1), ball_dia)
+        balls = [(SNOOKER_RED, pos) for pos in reds] + SNOOKER_COLOURS
+        return balls, SNOOKER_CUE_POS, ball_dia
+
+    if rack == "stress":
+        count = ball_count or 300
+        left, top, right, bottom = PLAY_AREA
+        width = right - left - 2 * ball_dia
+        height = bottom - top - 2 * ball_dia
+        # Largest grid spacing that still fits count balls (plus a column kept free for the cue ball)
+        spacing = min(ball_dia + 4, ((width - ball_dia * 2) * height / count) ** 0.5)
+        dia = min(ball_dia, spacing - 2)
+        cols = int((width - ball_dia * 2) // spacing)
+        balls = []
+        for n in range(count):
+            row, col = divmod(n, cols)
+            balls.append((1 + n % 15, (left + ball_dia + col * spacing, top + ball_dia + row * spacing)))
+        return balls, (right - ball_dia * 1.5, (top + bottom) / 2), dia
+
+    raise ValueError("unknown rack {!r}, expected one of {}".format(rack, ", ".join(RACKS)))
+
+
+def build_rack(space, static_body, ball_dia=BALL_DIA, headless=False, rack="8ball", ball_count=None, friction="pivot"):
+
+    """
+    Creates the balls for a rack and adds the cue ball last.
+    The cue ball is always balls[-1], which the rest of the game relies on. Balls are numbered 1 upwards;
+    the cue ball keeps number 16 whenever the rack fits in the standard set.
+    """
+
+    layout, cue_pos, ball_dia = rack_layout(rack, ball_count, ball_dia)
+    balls = []
+    for n, (imageOfBall, pos) in enumerate(layout):
+        balls.append(ball8_sprites.Ball(ball_dia / 2, pos, space, static_body, imageOfBall, headless, n + 1, friction))
+    cue_number = max(16, len(layout) + 1)
+    balls.append(ball8_sprites.Ball(ball_dia / 2, cue_pos, space, static_body, 16, headless, cue_number, friction))
+
+    if len(balls) >= SPATIAL_HASH_MIN:
+        # Cells one and a half balls across and about ten cells per shape measured best for packed racks
+        space.use_spatial_hash(ball_dia * 1.5, 10 * (len(balls) + 6))
+    return balls
+
+
+# ================================================ GAME STATE ======================================================
+
+class GameState():
+
+    """
+    Holds everything needed to play a game without a window: the pymunk space, cushions,
+    balls, pockets, lives and score. The main loop drives it with take_shot() and step().
+    """
+
+    def __init__(self, lives=LIVES, headless=True, potted_sound=None, dt=STEP_DT, rack="8ball", ball_count=None,
+                 friction="pivot"):
+
+        # Create the physics simulation space
+        self.__space = pymunk.Space()
+        self.__static_body = self.__space.static_body
+        self.__dt = dt
+
+        # Let pymunk sleep idle balls; the table is at rest once every ball is asleep
+        self.__space.sleep_time_threshold = SLEEP_TIME
+        self.__space.idle_speed_threshold = REST_SPEED
+        self.__decel = 0.0
+        if friction == "damping":
+            # No constraint holds the balls back, so step() takes this much speed off every ball each step.
+            # Writing velocities would wake sleeping bodies, so nothing sleeps: the table is at rest once
+            # every ball has been idle for SLEEP_TIME instead
+            self.__space.sleep_time_threshold = math.inf
+            self.__decel = DAMPING_DECEL * dt
+            self.__velocities = pymunk.batch.Buffer()
+        self.__still_steps = 0
+
+        self.__cushions = []
+        for c_n in range(6):
+            self.__cushions.append(ball8_sprites.Cushions(c_n, self.__space))
+
+        self.__balls = build_rack(self.__space, self.__static_body, BALL_DIA, headless, rack, ball_count, friction)
+        self.__friction = friction
+        self.__rack = rack
+        self.__ball_count = ball_count
+        self.__cue_start = self.__balls[-1].get_position()  # Where the cue ball is re-spotted after a scratch
+        self.__all_balls = list(self.__balls)  # Every ball in rack order, potted or not
+        # Sized for the rack's own balls (the stress rack shrinks them to fit)
+        self.__pockets = ball8_sprites.Pockets(potted_sound, self.__space, self.__balls[-1].get_shape().radius)
+
+        self.__potted_balls = []  # Image names of potted object balls, in the order they dropped
+        self.__cueball_ispotted = False
+        self.__lives = lives
+        self.__score = 0
+        self.__steps = 0
+        self.__at_rest = True
+        self.__rest_callback = None
+        self.__step_listeners = []
+        self.__profiler = None
+        self.__new_game = self.snapshot()  # The fresh rack, for reset()
+
+    def take_shot(self, angle, force):
+
+        """
+        Strikes the cue ball at the given cue angle (degrees) and force.
+        Shots are only allowed while every ball is at rest; returns whether the shot was taken.
+        """
+
+        if not self.__at_rest or self.is_over():
+            return False
+        self.__balls[-1].apply_impulse(force, angle)
+        self.__score += 1
+        self.__at_rest = False
+        self.__still_steps = 0
+        return True
+
+    def step(self, n=1):
+
+        """
+        Advances the simulation by up to n physics steps, handling pocketing after each one.
+        Nothing is stepped while the table is at rest; stepping stops as soon as it comes to rest.
+        """
+
+        if self.__at_rest:
+            return
+        for i in range(n):
+            start = time.perf_counter()
+            self.__space.step(self.__dt)
+            if self.__decel:
+                self.__roll()
+            stepped = time.perf_counter()
+            self.__steps += 1
+            self.__cueball_ispotted = self.__pockets.if_potted(
+                self.__balls, self.__space, self.__potted_balls, self.__cueball_ispotted
+            )
+            potted = time.perf_counter()
+            for listener in self.__step_listeners:
+                listener(self)
+            if self.__profiler is not None:
+                self.__profiler.add("physics", stepped - start)
+                self.__profiler.add("pockets", potted - stepped)
+                self.__profiler.add("listeners", time.perf_counter() - potted)
+            if self.__balls_asleep():
+                self.__come_to_rest()
+                return
+
+    def resolve_shot(self, max_steps=MAX_SHOT_STEPS):
+
+        """
+        Simulates the current shot as fast as possible, with no rendering, until the table is at rest.
+        Pocketing is applied along the way; returns how many physics steps the shot took.
+        """
+
+        start = self.__steps
+        self.step(max_steps)
+        for ball in self.__balls:
+            ball.save_position()  # Jump straight to the final layout instead of interpolating to it
+        return self.__steps - start
+
+    def play_shot(self, angle, force, max_steps=MAX_SHOT_STEPS):
+
+        """
+        Takes a shot and resolves it instantly; returns the step count, or None if no shot was allowed.
+        """
+
+        if not self.take_shot(angle, force):
+            return None
+        return self.resolve_shot(max_steps)
+
+    def trace_aim(self, angle, length=AIM_LENGTH):
+
+        """
+        Sweeps the cue ball along a cue angle (degrees, as take_shot) with one segment query, no simulation.
+        Returns a dict of logical points: "start", "ghost" (cue ball centre at first contact, or the end of
+        the trace) and "hit" ("ball", "cushion" or None). A ball hit adds "target" (object ball centre),
+        "target_dir" and "cue_dir" (where each ball heads, scaled by the share of speed it takes);
+        a cushion hit adds "bounce_dir", the mirrored direction.
+        """
+
+        cue_ball = self.__balls[-1]
+        radius = cue_ball.get_shape().radius
+        start = cue_ball.get_position()
+        direction = pymunk.Vec2d(-math.cos(math.radians(angle)), math.sin(math.radians(angle)))  # as Ball.apply_impulse
+        end = start + direction * length
+
+        first = None
+        for info in self.__space.segment_query(start, end, radius - 0.01, ball8_sprites.SOLID_FILTER):
+            if info.shape is not cue_ball.get_shape() and (first is None or info.alpha < first.alpha):
+                first = info
+
+        trace = {"start": start, "ghost": end, "hit": None}
+        if first is None:
+            return trace
+        ghost = start + (end - start) * first.alpha
+        trace["ghost"] = ghost
+
+        if first.shape.body.body_type == pymunk.Body.STATIC:
+            trace["hit"] = "cushion"
+            normal = first.normal
+            trace["bounce_dir"] = direction - normal * (2 * direction.dot(normal))
+        else:
+            # Equal masses: the object ball leaves along the line of centres with the matching share
+            # of the speed, the cue ball along the perpendicular (the 90 degree rule)
+            target = first.shape.body.position
+            target_dir = (target - ghost).normalized()
+            share = direction.dot(target_dir)
+            trace["hit"] = "ball"
+            trace["target"] = target
+            trace["target_dir"] = target_dir * share
+            trace["cue_dir"] = direction - target_dir * share
+        return trace
+
+    def get_layout(self):
+
+        """
+        Returns the balls still on the table as (ball number, x, y) tuples, cue ball last.
+        Ball numbers are unique within a rack, unlike image names (every snooker red shares one image).
+        """
+
+        layout = []
+        for ball in self.__balls:
+            layout.append((ball.get_number(), ball.get_position()[0], ball.get_position()[1]))
+        return layout
+
+    def set_layout(self, layout):
+
+        """
+        Places the balls as described by get_layout() on a table with the same rack, all at rest.
+        Balls missing from the layout are treated as already potted and taken off the table.
+        """
+
+        positions = {}
+        for number, x, y in layout:
+            positions[number] = (x, y)
+        for ball in list(self.__balls):
+            if ball.get_number() in positions:
+                ball.set_body_position(positions[ball.get_number()])
+                ball.set_body_velocity((0.0, 0.0))
+            elif ball is not self.__balls[-1]:
+                self.__space.remove(*ball.get_physics())
+                ball.kill()
+                self.__balls.remove(ball)
+                self.__potted_balls.append(ball.get_image_name())
+        self.__at_rest = True
+
+    def snapshot(self):
+
+        """
+        Captures lives, score and every ball's position, velocity, spin and potted status
+        in one small flat array that restore() can put back.
+        """
+
+        buf = numpy.empty(SNAPSHOT_HEADER + SNAPSHOT_BALL * len(self.__all_balls))
+        buf[0:SNAPSHOT_HEADER] = (self.__lives, self.__score, self.__cueball_ispotted, self.__at_rest)
+
+        # Pot order per ball index: several balls can share an image (every snooker red), so each name
+        # in potted_balls is matched to the next off-table ball with that image, in rack order
+        off_table = {}
+        for i, ball in enumerate(self.__all_balls):
+            if ball.get_body().space is None:
+                off_table.setdefault(ball.get_image_name(), []).append(i)
+        pot_order = {}
+        for place, name in enumerate(self.__potted_balls):
+            pot_order[off_table[name].pop(0)] = place + 1
+
+        for i, ball in enumerate(self.__all_balls):
+            body = ball.get_body()
+            base = SNAPSHOT_HEADER + i * SNAPSHOT_BALL
+            buf[base:base + SNAPSHOT_BALL] = (
+                pot_order.get(i, 0),
+                body.position[0], body.position[1],
+                body.velocity[0], body.velocity[1],
+                body.angle, body.angular_velocity,
+            )
+        return buf
+
+    def restore(self, buf):
+
+        """
+        Puts the table back exactly as snapshot() saw it, reusing the existing space and balls.
+        Returns the balls that were back on the table after being potted, so callers can re-add
+        them to their sprite groups.
+        """
+
+        self.__lives = int(buf[0])
+        self.__score = int(buf[1])
+        self.__cueball_ispotted = bool(buf[2])
+        self.__at_rest = bool(buf[3])
+        self.__still_steps = 0
+
+        returned = []
+        potted = []
+        del self.__balls[:]  # Refilled in place, the main loop holds on to this list
+        for i, ball in enumerate(self.__all_balls):
+            base = SNAPSHOT_HEADER + i * SNAPSHOT_BALL
+            on_space = ball.get_body().space is not None
+            if buf[base] == 0:
+                if not on_space:
+                    self.__space.add(*ball.get_physics())
+                    returned.append(ball)
+                body = ball.get_body()
+                ball.set_body_position((buf[base + 1], buf[base + 2]))
+                body.velocity = (buf[base + 3], buf[base + 4])
+                body.angle = buf[base + 5]
+                body.angular_velocity = buf[base + 6]
+                self.__balls.append(ball)
+            else:
+                if on_space:
+                    self.__space.remove(*ball.get_physics())
+                    ball.kill()
+                potted.append((buf[base], ball.get_image_name()))
+
+        potted.sort(key=lambda entry: entry[0])
+        del self.__potted_balls[:]
+        for order, name in potted:
+            self.__potted_balls.append(name)
+        return returned
+
+    def reset(self):
+
+        """
+        Starts a new game on the same table: every ball, potted or not, goes back to its rack position
+        and lives and score start over. Nothing is rebuilt; returns the balls that were back on the table,
+        as restore() does.
+        """
+
+        return self.restore(self.__new_game)
+
+    def __roll(self):
+        # Constant rolling resistance, as a pivot joint gives: every ball loses the same speed each step until
+        # it stops dead. All velocities are read and written back with one batch call each, not ball by ball;
+        # numpy only pays for its per-call overhead on big racks
+        buf = self.__velocities
+        buf.clear()
+        pymunk.batch.get_space_bodies(self.__space, pymunk.batch.BodyFields.VELOCITY, buf)
+        if len(buf.float_buf()) < DAMPING_NUMPY_MIN * 16:  # two 8 byte floats per body
+            moving = self.__roll_small(memoryview(buf.float_buf()).cast("d"))
+        else:
+            velocity = numpy.frombuffer(buf.float_buf(), dtype=numpy.float64).reshape(-1, 2)
+            speed = numpy.hypot(velocity[:, 0], velocity[:, 1])
+            moving = speed.max() >= REST_SPEED
+            if moving:
+                velocity *= (numpy.maximum(speed - self.__decel, 0.0) / numpy.maximum(speed, self.__decel))[:, None]
+        if not moving:
+            self.__still_steps += 1  # Every ball is idle, the same test pymunk uses before putting bodies to sleep
+            return
+        self.__still_steps = 0
+        pymunk.batch.set_space_bodies(self.__space, pymunk.batch.BodyFields.VELOCITY, buf)
+
+    def __roll_small(self, velocity):
+        # The same slowdown as a plain loop over the flat (vx, vy, vx, vy, ...) buffer; returns whether anything moves
+        moving = False
+        for i in range(0, len(velocity), 2):
+            vx = velocity[i]
+            vy = velocity[i + 1]
+            speed = math.hypot(vx, vy)
+            if speed == 0.0:
+                continue
+            moving = moving or speed >= REST_SPEED
+            scale = (speed - self.__decel) / speed if speed > self.__decel else 0.0
+            velocity[i] = vx * scale
+            velocity[i + 1] = vy * scale
+        return moving
+
+    def __balls_asleep(self):
+        if self.__decel:
+            return self.__still_steps * self.__dt >= SLEEP_TIME
+        for ball in self.__balls:
+            if not ball.get_body().is_sleeping:
+                return False
+        return True
+
+    def __come_to_rest(self):
+
+        """
+        Runs once per shot when every ball has fallen asleep: a scratched cue ball is re-spotted
+        (costing a life) and the rest callback, if any, is told.
+        """
+
+        self.__at_rest = True
+        if self.__cueball_ispotted:
+            self.__balls[-1].set_body_position(self.__cue_start)
+            self.__cueball_ispotted = False
+            if self.__lives != 0:
+                self.__lives -= 1
+        if self.__rest_callback is not None:
+            self.__rest_callback(self)
+
+    def set_rest_callback(self, callback):
+        self.__rest_callback = callback  # called as callback(game) each time the table comes to rest
+
+    def set_pot_callback(self, callback):
+        self.__pockets.set_callback(callback)  # called as callback(ball, is_cue_ball) as each ball drops
+
+    def add_step_listener(self, listener):
+        self.__step_listeners.append(listener)  # called as listener(game) after every physics step
+
+    def remove_step_listener(self, listener):
+        self.__step_listeners.remove(listener)
+
+    def set_profiler(self, profiler):
+        self.__profiler = profiler  # a FrameProfiler that is sent physics, pocket and step listener timings, or None
+
+    def is_over(self):
+        return self.__lives == 0 or len(self.__balls) == 1
+
+    def is_won(self):
+        return len(self.__balls) == 1
+
+    # === Getters ===
+
+    def is_at_rest(self):
+        return self.__at_rest
+
+    def get_space(self):
+        return self.__space
+
+    def get_balls(self):
+        return self.__balls
+
+    def get_all_balls(self):
+        return self.__all_balls  # in rack order, potted or not
+
+    def get_cue_ball(self):
+        return self.__balls[-1]
+
+    def get_potted_balls(self):
+        return self.__potted_balls
+
+    def get_lives(self):
+        return self.__lives
+
+    def get_score(self):
+        return self.__score
+
+    def get_steps(self):
+        return self.__steps
+
+    def get_dt(self):
+        return self.__dt
+
+    def get_friction(self):
+        return self.__friction
+
+    def get_rack(self):
+        return self.__rack
+
+    def get_ball_count(self):
+        return self.__ball_count
+
+
+# ============================================= FIXED TIMESTEP =====================================================
+
+class FixedTimestep():
+
+    """
+    Runs the game's physics at its own fixed rate no matter how fast frames are rendered.
+    Real frame time is collected in an accumulator and spent in whole physics steps; at most
+    max_steps are taken per frame so a long stall slows the game down instead of freezing it.
+    """
+
+    def __init__(self, game, max_steps=8, speed=1):
+        self.__game = game
+        self.__dt = game.get_dt()
+        self.__max_steps = max_steps
+        self.__speed = speed  # Playback multiplier: 4 fast-forwards the game at four times real time
+        self.__accumulator = 0.0
+
+    def advance(self, frame_seconds):
+
+        """
+        Steps the physics for the real time that passed since the last frame.
+        Returns how far (0 to 1) the render time is between the last two physics states.
+        """
+
+        self.__accumulator += frame_seconds * self.__speed
+        steps = int(self.__accumulator / self.__dt)
+        budget = max(1, int(self.__max_steps * self.__speed))
+        if steps > budget:
+            # Over the catch-up budget: drop the extra time rather than spiral
+            steps = budget
+            self.__accumulator = steps * self.__dt
+        self.__accumulator -= steps * self.__dt
+
+        for i in range(steps):
+            if i == steps - 1:
+                for ball in self.__game.get_balls():
+                    ball.save_position()  # Interpolate from the state before the final step
+            self.__game.step()
+
+        return self.__accumulator / self.__dt
+
+    def reset(self):
+        self.__accumulator = 0.0
+
+    def set_speed(self, speed):
+        self.__speed = speed
+
+    def get_speed(self):
+        return self.__speed
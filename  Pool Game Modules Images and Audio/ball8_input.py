@@ -0,0 +1,64 @@
+"""
+===================================================================================================================
+|  Name: Safiya                                                                                                    |
+|  Date: October 16th, 2026                                                                                        |
+|  Description: Input File for 8-Ball Video Game                                                                   |
+|               Drains the pygame event queue once per frame into a single summary of what the player did          |
+|               Contains classes FrameInput and InputDispatcher                                                    |
+===================================================================================================================
+"""
+
+# =========================================== IMPORTS AND INITIALIZATION ===========================================
+
+import pygame
+
+
+# =============================================== FRAME INPUT =====================================================
+
+class FrameInput():
+
+    """
+    Everything the player did during one frame. Mouse motion is coalesced to the latest position.
+    """
+
+    def __init__(self, held):
+        self.quit = False
+        self.mouse_pos = None      # Latest mouse position if the mouse moved this frame
+        self.button_down = False   # Mouse button pressed this frame
+        self.button_up = False     # Mouse button released this frame
+        self.held = held           # Mouse button down at the end of the frame
+        self.keys = []             # Keys pressed this frame, in order
+
+
+# ============================================= INPUT DISPATCHER ==================================================
+
+class InputDispatcher():
+
+    """
+    Reads every queued event exactly once per frame and remembers whether the mouse button is held
+    between frames, so holding the button needs no repeated events.
+    """
+
+    def __init__(self):
+        self.__held = False
+
+    def poll(self):
+        frame = FrameInput(self.__held)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                frame.quit = True
+            elif event.type == pygame.MOUSEMOTION:
+                frame.mouse_pos = event.pos
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                frame.button_down = True
+                self.__held = True
+            elif event.type == pygame.MOUSEBUTTONUP:
+                frame.button_up = True
+                self.__held = False
+            elif event.type == pygame.KEYDOWN:
+                frame.keys.append(event.key)
+        frame.held = self.__held
+        return frame
+
+    def is_held(self):
+        return self.__held
@@ -0,0 +1,359 @@
+"""
+===================================================================================================================
+|  Name: Safiya                                                                                                    |
+|  Date: October 16th, 2026                                                                                        |
+|  Description: Network File for 8-Ball Video Game                                                                 |
+|               Two-player games over TCP: shots travel as (angle, force) only, clients either re-simulate         |
+|               them or follow quantized, delta-compressed ball positions, and every rest resyncs exactly          |
+|               Contains classes DeltaEncoder, DeltaDecoder and NetSession                                         |
+===================================================================================================================
+"""
+
+# =========================================== IMPORTS AND INITIALIZATION ===========================================
+
+import asyncio
+import queue
+import struct
+import threading
+import time
+import numpy
+
+"""
+Messages are a 5 byte header (payload length, type) followed by the payload, little endian:
+- HELLO   client -> host   sync mode byte (0 re-simulate, 1 snapshots)
+- WELCOME host -> client   player number, whose turn, then a full REST style snapshot of the table
+- SHOT    both ways        player number, cue angle, force (float64, so re-simulation is exact)
+- DELTA   host -> client   on-table bitmask, changed bitmask, then x, y (uint16, 1/16 px) of each changed ball
+- REST    host -> client   whose turn, then GameState.snapshot() as float64
+A shot is only ever applied once the host has echoed it, so every table sees shots in the same order.
+"""
+
+PORT = 8808
+HEADER = struct.Struct("<IB")
+HELLO, WELCOME, SHOT, DELTA, REST = range(1, 6)
+SHOT_BODY = struct.Struct("<Bdd")
+TURN_BODY = struct.Struct("<BB")
+SYNC_MODES = ("resim", "snapshots")
+TICK_HZ = 20                     # DELTA messages per second while the balls roll
+QUANTUM = 16                     # Positions are sent in 1/16 logical pixels
+OFF_TABLE = (-10000000, -10000000)
+
+
+# ============================================= DELTA ENCODING =====================================================
+
+def mask_bytes(count):
+    return (count + 7) // 8
+
+
+class DeltaEncoder():
+
+    """
+    Quantizes ball positions to 1/16 px and only sends the balls whose quantized position changed
+    since the last message, so resting balls cost nothing.
+    """
+
+    def __init__(self, count):
+        self.__count = count
+        self.__last = numpy.full((count, 2), -1, dtype=numpy.int32)
+        self.__last_on_table = None
+
+    def reset(self):
+        self.__last.fill(-1)
+        self.__last_on_table = None
+
+    def encode(self, positions, on_table):
+
+        """
+        Returns the DELTA payload for (count, 2) logical positions and a boolean on-table array,
+        or None if nothing visible changed. Balls outside the encodable range (a scratched cue ball
+        parked at OFF_TABLE) are sent as off the table.
+        """
+
+        quantized = numpy.rint(numpy.asarray(positions) * QUANTUM)
+        on_table = on_table & ((quantized >= 0) & (quantized <= 65535)).all(axis=1)
+        quantized = numpy.clip(quantized, 0, 65535).astype(numpy.int32)
+        changed = (quantized != self.__last).any(axis=1) & on_table
+        on_bits = numpy.packbits(on_table, bitorder="little").tobytes()
+        if not changed.any() and on_bits == self.__last_on_table:
+            return None
+        self.__last[changed] = quantized[changed]
+        self.__last_on_table = on_bits
+        return on_bits + numpy.packbits(changed, bitorder="little").tobytes() + quantized[changed].astype("<u2").tobytes()
+
+
+class DeltaDecoder():
+
+    """
+    Rebuilds full position arrays from DELTA payloads, keeping the last known position of every ball.
+    """
+
+    def __init__(self, count):
+        self.__count = count
+        self.__positions = numpy.zeros((count, 2))
+
+    def set_positions(self, positions):
+        self.__positions[:] = positions
+
+    def decode(self, payload):
+        size = mask_bytes(self.__count)
+        on_table = numpy.unpackbits(numpy.frombuffer(payload[:size], numpy.uint8), count=self.__count, bitorder="little")
+        changed = numpy.unpackbits(numpy.frombuffer(payload[size:2 * size], numpy.uint8), count=self.__count, bitorder="little")
+        values = numpy.frombuffer(payload[2 * size:], "<u2").reshape(-1, 2)
+        self.__positions[changed.astype(bool)] = values / QUANTUM
+        return self.__positions.copy(), on_table.astype(bool)
+
+
+# ============================================== NET SESSION =======================================================
+
+class NetSession():
+
+    """
+    One end of a two-player game. The asyncio connection runs on its own thread; the pygame loop
+    calls poll() each frame for what arrived and send_shot() when the local player shoots.
+    The host (player 0) owns the real table: it decides whose turn it is, streams DELTA messages
+    while the balls roll and sends the exact table in a REST message every time they stop.
+
+    poll() returns events as tuples:
+    ("joined", player), ("left",), ("shot", player, angle, force), ("positions", positions, on_table)
+    and ("rest", turn, snapshot)
+    """
+
+    def __init__(self, role, game, address=("127.0.0.1", PORT), sync="resim", tick_hz=TICK_HZ):
+        if role not in ("host", "client"):
+            raise ValueError("unknown network role {!r}, expected host or client".format(role))
+        self.__role = role
+        self.__game = game
+        self.__address = address
+        self.__sync = sync
+        self.__events = queue.Queue()
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(target=self.__loop.run_forever, name="net", daemon=True)
+        self.__peers = {}          # host: writer -> sync mode
+        self.__server = None
+        self.__writer = None       # client: connection to the host
+        self.__connected = False
+        self.__player = 0 if role == "host" else None
+        self.__turn = 0
+        self.__moving = False      # client: between a shot and the host's REST
+        self.__ball_count = len(game.get_all_balls())
+        self.__encoder = DeltaEncoder(self.__ball_count)
+        self.__decoder = DeltaDecoder(self.__ball_count)
+        self.__tick_steps = max(1, round(1 / (game.get_dt() * tick_hz)))
+        self.__last_delta = time.perf_counter()
+        self.__delta_interval = 1 / tick_hz
+        self.__bytes_sent = 0
+        self.__bytes_received = 0
+
+    # === Lifetime ===
+
+    def start(self):
+
+        """
+        Starts listening (host) or connects to the host and says hello (client), giving up after 5 seconds.
+        """
+
+        self.__thread.start()
+        if self.__role == "host":
+            asyncio.run_coroutine_threadsafe(self.__serve(), self.__loop).result(5)
+            self.__game.add_step_listener(self.__on_step)
+            self.__game.set_rest_callback(self.__on_rest)
+        else:
+            asyncio.run_coroutine_threadsafe(self.__connect(), self.__loop).result(5)
+        return self
+
+    def close(self):
+        if self.__role == "host":
+            self.__game.remove_step_listener(self.__on_step)
+            self.__game.set_rest_callback(None)
+        if self.__thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self.__shutdown(), self.__loop).result(5)
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+            self.__thread.join(1)
+
+    async def __shutdown(self):
+        # Closing the sockets ends both ends' reader tasks, so the other player sees "left"
+        for writer in list(self.__peers) + [self.__writer]:
+            if writer is not None:
+                writer.close()
+        if self.__server is not None:
+            self.__server.close()
+        readers = asyncio.all_tasks() - {asyncio.current_task()}
+        if readers:
+            await asyncio.wait(readers, timeout=1)
+
+    async def __serve(self):
+        self.__server = await asyncio.start_server(self.__handle_client, self.__address[0], self.__address[1])
+
+    async def __connect(self):
+        reader, self.__writer = await asyncio.open_connection(self.__address[0], self.__address[1])
+        self.__write(self.__writer, HELLO, bytes([SYNC_MODES.index(self.__sync)]))
+        self.__loop.create_task(self.__read_host(reader))
+
+    # === Wire ===
+
+    def __write(self, writer, kind, payload):
+        writer.write(HEADER.pack(len(payload), kind) + payload)
+        self.__bytes_sent += HEADER.size + len(payload)
+
+    async def __read(self, reader):
+        length, kind = HEADER.unpack(await reader.readexactly(HEADER.size))
+        payload = await reader.readexactly(length)
+        self.__bytes_received += HEADER.size + length
+        return kind, payload
+
+    def __broadcast(self, kind, payload, snapshots_only=False):
+        # Only ever called on the network thread
+        for writer, sync in list(self.__peers.items()):
+            if not snapshots_only or sync == "snapshots":
+                self.__write(writer, kind, payload)
+
+    def __send_threadsafe(self, kind, payload, snapshots_only=False):
+        if self.__role == "host":
+            self.__loop.call_soon_threadsafe(self.__broadcast, kind, payload, snapshots_only)
+        elif self.__writer is not None:
+            self.__loop.call_soon_threadsafe(self.__write, self.__writer, kind, payload)
+
+    # === Host side ===
+
+    async def __handle_client(self, reader, writer):
+        if self.__peers:
+            writer.close()  # Two players only
+            return
+        try:
+            kind, payload = await self.__read(reader)
+            if kind != HELLO:
+                writer.close()
+                return
+            self.__peers[writer] = SYNC_MODES[payload[0]]
+            self.__connected = True
+            self.__events.put(("joined", 1))  # poll() sends the table from the main thread
+            while True:
+                kind, payload = await self.__read(reader)
+                if kind == SHOT:
+                    player, angle, force = SHOT_BODY.unpack(payload)
+                    if player == self.__turn == 1:
+                        self.__events.put(("shot", 1, angle, force))  # Echoed by send_shot() once it is played
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        self.__peers.pop(writer, None)
+        self.__connected = False
+        self.__turn = 0
+        self.__events.put(("left",))
+
+    def __on_step(self, game):
+        # Step listener: a DELTA every tick_steps physics steps, and only for clients that asked for them
+        if game.get_steps() % self.__tick_steps == 0 and self.__peers:
+            self.__send_delta(game)
+
+    def __send_delta(self, game):
+        balls = game.get_all_balls()
+        positions = numpy.array([ball.get_position() for ball in balls])
+        on_table = numpy.array([ball.get_body().space is not None for ball in balls])
+        payload = self.__encoder.encode(positions, on_table)
+        if payload is not None:
+            self.__send_threadsafe(DELTA, payload, snapshots_only=True)
+
+    def __on_rest(self, game):
+        # Rest callback: the turn passes to the other player (if there is one) and everyone gets the exact table
+        if self.__peers:
+            self.__turn = 1 - self.__turn
+        self.__send_delta(game)
+        self.__send_threadsafe(REST, TURN_BODY.pack(0, self.__turn) + game.snapshot().tobytes())
+        self.__events.put(("rest", self.__turn, None))
+
+    # === Client side ===
+
+    async def __read_host(self, reader):
+        try:
+            while True:
+                kind, payload = await self.__read(reader)
+                if kind == WELCOME or kind == REST:
+                    player, turn = TURN_BODY.unpack(payload[:TURN_BODY.size])
+                    snapshot = numpy.frombuffer(payload[TURN_BODY.size:], dtype=numpy.float64).copy()
+                    if kind == WELCOME:
+                        self.__player = player
+                        self.__connected = True
+                        self.__events.put(("joined", player))
+                    self.__turn = turn
+                    self.__moving = False
+                    self.__events.put(("rest", turn, snapshot))
+                elif kind == SHOT:
+                    player, angle, force = SHOT_BODY.unpack(payload)
+                    self.__moving = True
+                    self.__events.put(("shot", player, angle, force))
+                elif kind == DELTA:
+                    positions, on_table = self.__decoder.decode(payload)
+                    self.__last_delta = time.perf_counter()
+                    self.__events.put(("positions", positions, on_table))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        self.__connected = False
+        self.__moving = False
+        self.__events.put(("left",))
+
+    def follow(self, positions, on_table):
+
+        """
+        Snapshot mode: moves the local balls to positions from the host, keeping the previous position
+        so the sprites can be interpolated between DELTA messages with get_alpha().
+        """
+
+        for ball, pos, there in zip(self.__game.get_all_balls(), positions, on_table):
+            if there:
+                ball.save_position()
+                ball.get_body().position = tuple(pos)
+            else:
+                ball.set_body_position(OFF_TABLE)
+
+    def get_alpha(self):
+        return min(1.0, (time.perf_counter() - self.__last_delta) / self.__delta_interval)
+
+    # === Both ===
+
+    def send_shot(self, angle, force):
+
+        """
+        Host: called after a shot (its own or the client's) has been played, to echo it.
+        Client: called when the local player shoots; it is only played once the host echoes it back.
+        """
+
+        if self.__role == "host":
+            self.__send_threadsafe(SHOT, SHOT_BODY.pack(self.__turn, angle, force))
+        else:
+            self.__send_threadsafe(SHOT, SHOT_BODY.pack(self.__player, angle, force))
+
+    def poll(self):
+
+        """
+        Returns everything that arrived since the last call. Runs on the main thread, so this is
+        also where the host reads the table for a newly joined client.
+        """
+
+        events = []
+        while True:
+            try:
+                event = self.__events.get_nowait()
+            except queue.Empty:
+                return events
+            if event[0] == "joined" and self.__role == "host":
+                self.__encoder.reset()
+                self.__send_threadsafe(WELCOME, TURN_BODY.pack(1, self.__turn) + self.__game.snapshot().tobytes())
+            events.append(event)
+
+    def is_host(self):
+        return self.__role == "host"
+
+    def is_connected(self):
+        return self.__connected
+
+    def is_my_turn(self):
+        return self.__player == self.__turn
+
+    def is_moving(self):
+        return self.__moving
+
+    def get_sync(self):
+        return self.__sync
+
+    def get_traffic(self):
+        return self.__bytes_sent, self.__bytes_received
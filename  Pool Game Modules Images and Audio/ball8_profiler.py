@@ -0,0 +1,185 @@
+"""
+===================================================================================================================
+|  Name: Safiya                                                                                                    |
+|  Date: October 16th, 2026                                                                                        |
+|  Description: Profiler File for 8-Ball Video Game                                                                |
+|               Times each phase of the main loop into a ring buffer, draws a toggleable overlay and can           |
+|               stream every frame to CSV                                                                          |
+|               Contains classes FrameProfiler and ProfilerOverlay                                                 |
+===================================================================================================================
+"""
+
+# =========================================== IMPORTS AND INITIALIZATION ===========================================
+
+import time
+import numpy
+import pygame
+from ball8_assets import assets
+
+PHASES = ("input", "cue", "physics", "pockets", "listeners", "sprites", "draw", "flip")
+HISTOGRAM_BINS = numpy.arange(0, 34, 2)  # 2 ms wide buckets up to 32 ms, anything slower lands in the last one
+
+
+# ================================================ PROFILER ========================================================
+
+class FrameProfiler():
+
+    """
+    Low-overhead per-phase frame timer. mark(phase) charges the time since the previous mark to phase,
+    add(phase, seconds) charges time measured elsewhere (the engine reports physics, pockets and step listeners
+    this way). Time add()ed between two marks is taken out of the second mark, so it is never counted twice.
+    Each finished frame becomes one row of milliseconds in a fixed-size ring buffer, the last column
+    being the whole frame.
+    """
+
+    def __init__(self, capacity=1024, phases=PHASES):
+        self.__phases = phases
+        self.__index = {}
+        for i, name in enumerate(phases):
+            self.__index[name] = i
+        self.__samples = numpy.zeros((capacity, len(phases) + 1), dtype=numpy.float32)
+        self.__current = [0.0] * len(phases)
+        self.__frames = 0
+        self.__frame_start = 0.0
+        self.__last = 0.0
+        self.__reported = 0.0  # Seconds add()ed since the last mark
+        self.__csv = None
+
+    def begin_frame(self):
+        self.__frame_start = self.__last = time.perf_counter()
+        self.__reported = 0.0
+        for i in range(len(self.__current)):
+            self.__current[i] = 0.0
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.__current[self.__index[phase]] += now - self.__last - self.__reported
+        self.__last = now
+        self.__reported = 0.0
+
+    def add(self, phase, seconds):
+        self.__current[self.__index[phase]] += seconds
+        self.__reported += seconds
+
+    def end_frame(self):
+        now = time.perf_counter()
+        row = self.__samples[self.__frames % len(self.__samples)]
+        for i, seconds in enumerate(self.__current):
+            row[i] = seconds * 1000
+        row[-1] = (now - self.__frame_start) * 1000
+        if self.__csv is not None:
+            self.__csv.write("{},{}\n".format(self.__frames, ",".join("%.4f" % ms for ms in row)))
+        self.__frames += 1
+
+    # === Reporting ===
+
+    def recent(self, n=None):
+
+        """
+        Returns the last n frames (all buffered frames by default) as rows of milliseconds, oldest first.
+        """
+
+        count = min(self.__frames, len(self.__samples))
+        if n is not None:
+            count = min(count, n)
+        end = self.__frames % len(self.__samples)
+        rows = numpy.roll(self.__samples, -end, axis=0)
+        return rows[len(rows) - count:]
+
+    def averages(self, n=120):
+
+        """
+        Returns {phase: mean ms} over the last n frames, including "frame" for the whole frame.
+        """
+
+        rows = self.recent(n)
+        result = {}
+        if len(rows) == 0:
+            return result
+        means = rows.mean(axis=0)
+        for i, name in enumerate(self.__phases):
+            result[name] = float(means[i])
+        result["frame"] = float(means[-1])
+        return result
+
+    def histogram(self, n=None):
+        rows = self.recent(n)
+        counts, edges = numpy.histogram(numpy.minimum(rows[:, -1], HISTOGRAM_BINS[-1] - 0.001), bins=HISTOGRAM_BINS)
+        return counts, edges
+
+    def get_phases(self):
+        return self.__phases
+
+    def get_frame_count(self):
+        return self.__frames
+
+    # === Output ===
+
+    def open_csv(self, path):
+
+        """
+        Streams every finished frame to a CSV file from now on.
+        """
+
+        self.close_csv()
+        self.__csv = open(path, "w")
+        self.__csv.write("frame,{},total\n".format(",".join(self.__phases)))
+
+    def close_csv(self):
+        if self.__csv is not None:
+            self.__csv.close()
+            self.__csv = None
+
+    def dump(self, path):
+        # Saves the ring buffer (oldest frame first) as a NumPy .npy file for offline analysis
+        numpy.save(path, self.recent())
+
+
+# ============================================= PROFILER OVERLAY ==================================================
+
+class ProfilerOverlay(pygame.sprite.DirtySprite):
+
+    """
+    Shows per-phase milliseconds and a frame-time histogram in the corner of the screen.
+    It is only re-rendered every few frames so it barely shows up in its own numbers.
+    """
+
+    def __init__(self, profiler, pos, refresh_frames=30):
+        pygame.sprite.DirtySprite.__init__(self)
+        self.__profiler = profiler
+        self.__font = assets.get_font("couriernew", 14)
+        self.__refresh_frames = refresh_frames
+        self.__next_refresh = 0
+        self.image = pygame.Surface((230, 20 * (len(profiler.get_phases()) + 1) + 70), pygame.SRCALPHA)
+        self.rect = self.image.get_rect()
+        self.rect.topleft = pos
+        self.visible = 0
+
+    def toggle(self):
+        self.visible = 0 if self.visible else 1
+        self.__next_refresh = 0
+
+    def update(self):
+        if not self.visible or self.__profiler.get_frame_count() < self.__next_refresh:
+            return
+        self.__next_refresh = self.__profiler.get_frame_count() + self.__refresh_frames
+
+        self.image.fill((0, 0, 0, 170))
+        y = 5
+        averages = self.__profiler.averages()
+        for name in self.__profiler.get_phases() + ("frame",):
+            value = self.__font.render("%.2f ms" % averages.get(name, 0.0), 1, (255, 255, 255))
+            self.image.blit(self.__font.render(name, 1, (255, 255, 255)), (8, y))
+            self.image.blit(value, (self.image.get_width() - 8 - value.get_width(), y))  # right aligned
+            y += 20
+
+        # Frame-time histogram, one bar per 2 ms bucket
+        counts, edges = self.__profiler.histogram()
+        tallest = max(1, int(counts.max()))
+        bar_w = (self.image.get_width() - 16) // len(counts)
+        base = self.image.get_height() - 8
+        for i, count in enumerate(counts):
+            height = int(50 * count / tallest)
+            colour = (80, 200, 80) if edges[i + 1] <= 17 else (220, 80, 60)  # red past a 60 Hz frame
+            pygame.draw.rect(self.image, colour, (8 + i * bar_w, base - height, bar_w - 1, height))
+        self.dirty = 1
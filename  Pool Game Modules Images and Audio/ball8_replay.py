@@ -0,0 +1,192 @@
+"""
+===================================================================================================================
+|  Name: Safiya                                                                                                    |
+|  Date: October 16th, 2026                                                                                        |
+|  Description: Replay File for 8-Ball Video Game                                                                  |
+|               Records every physics step to a compact binary file and plays it back through a memory map        |
+|               Contains classes ReplayRecorder and ReplayReader                                                   |
+===================================================================================================================
+"""
+
+# =========================================== IMPORTS AND INITIALIZATION ===========================================
+
+import struct
+import numpy
+
+"""
+File layout (little endian):
+- 64 byte header: magic, version, ball slots, frames per chunk, frames recorded, on_table mask before frame 0
+- fixed-size chunks, each holding chunk_frames frames as
+    state[chunk_frames][4][16] float32   x, y, vx, vy of every ball slot (struct of arrays per frame)
+    on_table[chunk_frames] uint16        bit n set while ball n + 1 is on the table
+Ball n (1 to 15, cue ball 16) always lives in slot n - 1, and the last chunk is padded to full size,
+so any frame is found with a little arithmetic and no scanning.
+"""
+
+MAGIC = b"8BRP"
+VERSION = 2
+SLOTS = 16
+CUE_SLOT = SLOTS - 1
+PARKED_X = -1000000   # A scratched cue ball is parked far off the table (at -10000000) until it is re-spotted
+HEADER = struct.Struct("<4sHHIQH")
+HEADER_SIZE = 64
+CHUNK_FRAMES = 1024
+
+
+def chunk_dtype(chunk_frames):
+    return numpy.dtype([
+        ("state", "<f4", (chunk_frames, 4, SLOTS)),
+        ("on_table", "<u2", (chunk_frames,)),
+    ])
+
+
+# ================================================ RECORDER ========================================================
+
+class ReplayRecorder():
+
+    """
+    Appends one frame per physics step of a GameState (attach() registers it as a step listener).
+    Frames are gathered in a preallocated chunk and written out a whole chunk at a time.
+    """
+
+    def __init__(self, path, chunk_frames=CHUNK_FRAMES):
+        self.__file = open(path, "wb")
+        self.__chunk_frames = chunk_frames
+        self.__chunk = numpy.zeros(1, dtype=chunk_dtype(chunk_frames))[0]
+        self.__state = self.__chunk["state"]
+        self.__on_table = self.__chunk["on_table"]
+        self.__in_chunk = 0
+        self.__frames = 0
+        self.__initial_mask = 0
+        self.__write_header()
+
+    def __write_header(self):
+        header = HEADER.pack(MAGIC, VERSION, SLOTS, self.__chunk_frames, self.__frames, self.__initial_mask)
+        self.__file.seek(0)
+        self.__file.write(header.ljust(HEADER_SIZE, b"\0"))
+
+    def attach(self, game):
+        if len(game.get_balls()) > SLOTS:
+            raise ValueError("replays hold at most {} balls, this rack has {}".format(SLOTS, len(game.get_balls())))
+        if self.__frames == 0:
+            # Balls on the table before the first step, so balls potted on frame 0 are reported too
+            for ball in game.get_balls():
+                self.__initial_mask |= 1 << (ball.get_number() - 1)
+        game.add_step_listener(self.record)
+
+    def detach(self, game):
+        game.remove_step_listener(self.record)
+
+    def record(self, game):
+
+        """
+        Stores the position and velocity of every ball still on the table.
+        """
+
+        frame = self.__state[self.__in_chunk]
+        frame.fill(0.0)
+        mask = 0
+        for ball in game.get_balls():
+            slot = ball.get_number() - 1
+            body = ball.get_body()
+            frame[0, slot], frame[1, slot] = body.position
+            frame[2, slot], frame[3, slot] = body.velocity
+            mask |= 1 << slot
+        self.__on_table[self.__in_chunk] = mask
+
+        self.__in_chunk += 1
+        self.__frames += 1
+        if self.__in_chunk == self.__chunk_frames:
+            self.__flush_chunk()
+
+    def __flush_chunk(self):
+        self.__file.write(self.__chunk.tobytes())
+        self.__in_chunk = 0
+
+    def close(self):
+
+        """
+        Writes the last (zero padded) chunk and the final frame count.
+        """
+
+        if self.__in_chunk:
+            self.__state[self.__in_chunk:] = 0.0
+            self.__on_table[self.__in_chunk:] = 0
+            self.__flush_chunk()
+        self.__write_header()
+        self.__file.close()
+
+    def get_frame_count(self):
+        return self.__frames
+
+
+# ================================================= READER =========================================================
+
+class ReplayReader():
+
+    """
+    Memory-maps a replay file so any frame can be read instantly without re-running the physics.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, version, slots, chunk_frames, frames, initial_mask = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or slots != SLOTS:
+            raise ValueError("{} is not a version {} 8-ball replay".format(path, VERSION))
+        self.__chunk_frames = chunk_frames
+        self.__initial_mask = initial_mask
+        self.__frames = frames
+        if frames:
+            self.__chunks = numpy.memmap(path, dtype=chunk_dtype(chunk_frames), mode="r", offset=HEADER_SIZE)
+        else:
+            self.__chunks = None
+
+    def __len__(self):
+        return self.__frames
+
+    def __locate(self, i):
+        if i < 0:
+            i += self.__frames
+        if not 0 <= i < self.__frames:
+            raise IndexError("frame {} out of range for a {} frame replay".format(i, self.__frames))
+        return self.__chunks[i // self.__chunk_frames], i % self.__chunk_frames
+
+    def get_frame(self, i):
+
+        """
+        Returns (positions, velocities, on_table) for frame i: two (16, 2) arrays indexed by
+        ball number - 1, and a boolean array of which balls were on the table.
+        """
+
+        chunk, j = self.__locate(i)
+        state = chunk["state"][j]
+        on_table = (int(chunk["on_table"][j]) >> numpy.arange(SLOTS)) & 1
+        return state[0:2].T, state[2:4].T, on_table.astype(bool)
+
+    def get_positions(self, i):
+        chunk, j = self.__locate(i)
+        return chunk["state"][j][0:2].T
+
+    def potted_events(self):
+
+        """
+        Returns (frame, ball number) for every ball that left the table, in order.
+        A scratch is reported as the cue ball's number on the frame it was parked off the table
+        (the cue ball itself never leaves the list of balls; it is re-spotted once the balls stop).
+        """
+
+        events = []
+        if not self.__frames:
+            return events
+        masks = numpy.asarray(self.__chunks["on_table"]).reshape(-1)[:self.__frames].astype(numpy.int64)
+        masks = numpy.concatenate(([self.__initial_mask], masks))  # masks[i + 1] is frame i
+        cue_x = numpy.asarray(self.__chunks["state"][:, :, 0, CUE_SLOT]).reshape(-1)[:self.__frames]
+        parked = numpy.concatenate(([False], cue_x < PARKED_X))
+        for frame in range(self.__frames):
+            removed = int(masks[frame]) & ~int(masks[frame + 1])
+            for slot in range(SLOTS):
+                if removed & (1 << slot):
+                    events.append((frame, slot + 1))
+            if parked[frame + 1] and not parked[frame]:
+                events.append((frame, CUE_SLOT + 1))
+        return events
@@ -14,20 +14,32 @@ import pygame
 import pymunk
 import pymunk.pygame_util  # allows you to use features that will link the two libraries together
 import math
-pygame.mixer.init()
-pygame.init()
+import collections
+from ball8_assets import assets, view, CUE_SIZE, TABLE_SIZE  # shared, pre-scaled surfaces and the logical-to-screen mapping
+
+# Table friction: "pivot" pins every ball to the table with a force-limited PivotJoint, "damping" has no
+# constraints at all and the engine slows the balls itself after each step (see ball8_engine.DAMPING_DECEL)
+FRICTION_MODES = ("pivot", "damping")
+
+# Collision types, so handlers can be set for ball-pocket (and other) contacts
+BALL_TYPE = 1
+POCKET_TYPE = 2
+CUSHION_TYPE = 3
+POCKET_CATEGORY = 0b10  # Pocket sensors' filter category, left out of queries that only want solid shapes
+SOLID_FILTER = pymunk.ShapeFilter(mask=pymunk.ShapeFilter.ALL_MASKS() ^ POCKET_CATEGORY)
 
 
 # ================================================== BALL CLASS ====================================================
 
-class Ball(pygame.sprite.Sprite):
+class Ball(pygame.sprite.DirtySprite):
 
     """
     Represents a ball that interacts with each other using Pymunk physics
+    (headless balls skip image loading so they can be simulated with no display)
     """
 
-    def __init__(self, radius, pos, space, static_body, imageOfBall):
-        pygame.sprite.Sprite.__init__(self)
+    def __init__(self, radius, pos, space, static_body, imageOfBall, headless=False, number=None, friction="pivot"):
+        pygame.sprite.DirtySprite.__init__(self)
 
         # Create physical body and attach shape with elasticity
         self.__body = pymunk.Body()
@@ -36,19 +48,33 @@ class Ball(pygame.sprite.Sprite):
         self.__shape = pymunk.Circle(self.__body, radius)
         self.__shape.mass = 5
         self.__shape.elasticity = 0.9
-
-        # Attach pivot joint to simulate table friction and restrict unwanted rotation
-        self.__pivot = pymunk.PivotJoint(static_body, self.__body, (0, 0), (0, 0))
-        self.__pivot.max_bias = 0
-        self.__pivot.max_force = 10000
-
+        self.__shape.collision_type = BALL_TYPE
+
+        if friction == "pivot":
+            # Attach pivot joint to simulate table friction and restrict unwanted rotation
+            self.__pivot = pymunk.PivotJoint(static_body, self.__body, (0, 0), (0, 0))
+            self.__pivot.max_bias = 0
+            self.__pivot.max_force = 10000
+            self.__physics = (self.__body, self.__shape, self.__pivot)
+        elif friction == "damping":
+            self.__pivot = None  # Slowed down by the engine instead
+            self.__physics = (self.__body, self.__shape)
+        else:
+            raise ValueError("unknown friction mode {!r}, expected one of {}".format(friction, ", ".join(FRICTION_MODES)))
+
+        self.__number = number or imageOfBall  # 1 to 15 for object balls and 16 for the cue ball in a standard rack
         self.__imageName = ("ball_{}.png".format(imageOfBall))
-        self.image = pygame.image.load(self.__imageName).convert_alpha()
-        self.rect = self.image.get_rect()
-        self.rect.center = self.__body.position
-
-        # Add body, shape, and constraint to space
-        space.add(self.__body, self.__shape, self.__pivot)
+        if headless:
+            self.image = None
+            self.rect = pygame.Rect((0, 0), view.size((radius * 2, radius * 2)))
+        else:
+            self.image = assets.get_ball(self.__imageName, (radius * 2, radius * 2))
+            self.rect = self.image.get_rect()
+        self.rect.center = view.to_screen(self.__body.position)
+        self.__prev_position = self.__body.position  # Physics position before the latest step, for interpolation
+
+        # Add body, shape, and constraint (if any) to space
+        space.add(*self.__physics)
 
     def apply_impulse(self, force, cue_angle):
 
@@ -74,23 +100,41 @@ class Ball(pygame.sprite.Sprite):
     def get_image_name(self):
         return self.__imageName
 
+    def get_number(self):
+        return self.__number
+
     def get_shape(self):
         return self.__shape
 
     def get_pivot(self):
         return self.__pivot
 
+    def get_physics(self):
+        # Everything this ball adds to the space, for space.add(*...) and space.remove(*...)
+        return self.__physics
+
     # === Setters ===
     def set_body_position(self, pos):
         self.__body.position = pos
+        self.__prev_position = self.__body.position  # teleports are never interpolated
 
     def set_body_velocity(self, v):
 
         self.__body.velocity = v  # Unconventional, consider using `self.__body.velocity = v`
 
-    def update(self):
-        # Sync sprite position with physics position
-        self.rect.center = self.__body.position
+    def save_position(self):
+        self.__prev_position = self.__body.position
+
+    def update(self, alpha=1.0):
+        # Sync sprite position with physics position (blended from the previous step by alpha),
+        # only marking it dirty when it actually moved on screen
+        position = self.__body.position
+        if alpha < 1.0:
+            position = self.__prev_position + (position - self.__prev_position) * alpha
+        center = view.to_screen(position)
+        if center != self.rect.center:
+            self.rect.center = center
+            self.dirty = 1
 
 
 # ================================================ POOL TABLE ======================================================
@@ -103,7 +147,7 @@ class PoolTable(pygame.sprite.Sprite):
 
     def __init__(self):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.image.load("table.png")
+        self.image = assets.get_scaled("table.png", TABLE_SIZE)
         self.rect = self.image.get_rect()
         self.rect.topleft = (0, 0)
 
@@ -117,6 +161,7 @@ class Cushions(pygame.sprite.Sprite):
 
     """
     Represents the walls of the pool table using polygon pygame shapes/bodies for collision
+    (in logical table coordinates, whatever the screen resolution)
     """
 
     def __init__(self, c_n, space):
@@ -137,6 +182,7 @@ class Cushions(pygame.sprite.Sprite):
         self.__body.position = (0, 0)
         self.__shape = pymunk.Poly(self.__body, self.__vPolyDims[c_n])
         self.__shape.elasticity = 0.9
+        self.__shape.collision_type = CUSHION_TYPE
 
         space.add(self.__body, self.__shape)
 
@@ -146,34 +192,98 @@ class Cushions(pygame.sprite.Sprite):
 
 # =================================================== CUE =========================================================
 
-class Cue(pygame.sprite.Sprite):
+class Cue(pygame.sprite.DirtySprite):
 
     """
     Controls the cue stick, its angle, and applied force.
+    Rotated cue images are cached per 0.25 degree bucket (least recently used dropped first),
+    since a rotated cue stick can take over a megabyte the cache is kept small, and smaller
+    still when the view scales the cue up.
+    Positions passed in are logical; the sprite itself is placed in screen pixels.
     """
 
-    def __init__(self, pos):
-        pygame.sprite.Sprite.__init__(self)
+    ROTATION_STEP = 0.25
+    ROTATION_CACHE_SIZE = 96
+    MAX_FORCE = 20000
+    FORCE_RATE = 9000  # Force gained per second of holding the mouse (75 per frame at 120 fps)
+
+    def __init__(self, pos, cache_size=ROTATION_CACHE_SIZE):
+        pygame.sprite.DirtySprite.__init__(self)
         self.__angle = 0
-        self.__ogImage = pygame.image.load("cue.png")
-        self.image = pygame.transform.rotate(self.__ogImage, self.__angle)
+        self.__ogImage = assets.get_scaled("cue.png", CUE_SIZE)
+        # Most of cue.png is transparent padding that centres the stick on the cue ball, so only the stick
+        # itself is rotated and it is placed that far out along the aiming line instead
+        stick = self.__ogImage.get_bounding_rect()
+        self.__stick = self.__ogImage.subsurface(stick).copy()
+        self.__stick_offset = stick.centerx - self.__ogImage.get_width() / 2
+        self.__center = None  # Cue ball centre on screen the image was placed around
+        self.__rotations = collections.OrderedDict()
+        self.__cache_size = max(8, round(cache_size / max(1.0, view.get_scale()) ** 2))  # same memory at any scale
+        self.image = self.__rotated(self.__angle)
         self.rect = self.image.get_rect()
-        self.rect.center = pos
+        self.__refresh(pos)
         self.__force = 0
-        self.__max_force = 20000
+        self.__max_force = self.MAX_FORCE
         self.__force_direction = 1
 
+    def __rotated(self, angle):
+        bucket = round(angle / self.ROTATION_STEP)
+        image = self.__rotations.get(bucket)
+        if image is None:
+            image = pygame.transform.rotate(self.__stick, bucket * self.ROTATION_STEP)
+            self.__rotations[bucket] = image
+            if len(self.__rotations) > self.__cache_size:
+                self.__rotations.popitem(last=False)
+        else:
+            self.__rotations.move_to_end(bucket)
+        return image
+
+    def prewarm(self, angle=0.0, count=None):
+
+        """
+        Rotates the cue up front for the buckets nearest angle, working outwards both ways
+        (as many as the cache holds by default, never more), so the first aim is not spent rotating.
+        """
+
+        count = self.__cache_size if count is None else min(count, self.__cache_size)
+        bucket = round(angle / self.ROTATION_STEP)
+        for i in range(count):
+            offset = (i + 1) // 2 if i % 2 else -(i // 2)  # 0, +1, -1, +2, -2, ...
+            self.__rotated((bucket + offset) * self.ROTATION_STEP)
+        self.__rotated(self.__angle)  # The current aim stays the most recently used
+
+    def __refresh(self, center):
+        # Swap in the rotated stick around the cue ball, marking the sprite dirty only on a visible change
+        image = self.__rotated(self.__angle)
+        center = view.to_screen(center)
+        if image is not self.image or center != self.__center:
+            angle = math.radians(round(self.__angle / self.ROTATION_STEP) * self.ROTATION_STEP)
+            self.image = image
+            self.rect = image.get_rect()
+            self.rect.center = (round(center[0] + self.__stick_offset * math.cos(angle)),
+                                round(center[1] - self.__stick_offset * math.sin(angle)))
+            self.__center = center
+            self.dirty = 1
+
     def update(self, mouse_pos, cueBall_pos):
-        self.rect.center = cueBall_pos
         self.__x_dist = cueBall_pos[0] - mouse_pos[0]
         self.__y_dist = -(cueBall_pos[1] - mouse_pos[1])
         self.__angle = math.degrees(math.atan2(self.__y_dist, self.__x_dist))
+        self.__refresh(cueBall_pos)
         return self.__angle
 
-    def increase_force(self):
-        self.__force += 75 * self.__force_direction
-        if self.__force >= self.__max_force or self.__force <= 0:
-            self.__force_direction *= -1
+    def set_position(self, cueBall_pos):
+        self.__refresh(cueBall_pos)
+
+    def increase_force(self, seconds):
+        # Power swings between zero and the maximum for as long as the mouse is held
+        self.__force += self.FORCE_RATE * seconds * self.__force_direction
+        if self.__force >= self.__max_force:
+            self.__force = self.__max_force
+            self.__force_direction = -1
+        elif self.__force <= 0:
+            self.__force = 0
+            self.__force_direction = 1
 
     def change_force_direction(self):
         self.__force_direction = 1
@@ -185,28 +295,116 @@ class Cue(pygame.sprite.Sprite):
         return self.__force
 
     def draw(self, surface):
-        self.image = pygame.transform.rotate(self.__ogImage, self.__angle)
-        surface.blit(
-            self.image,
-            (
-                self.rect.centerx - self.image.get_width() / 2,
-                self.rect.centery - self.image.get_height() / 2
-            ),
-        )
+        # Direct blit for use outside a sprite group
+        surface.blit(self.image, self.rect)
 
 
 # ================================================ POWER BAR =======================================================
 
-class PowerBar(pygame.sprite.Sprite):
+class PowerBar(pygame.sprite.DirtySprite):
 
     """
-    Displays a red power bar rectangle (for visualizing cue power).
+    Displays red power bar blocks under the cue ball (one block per 2000 force, for visualizing cue power).
     """
 
+    MAX_BLOCKS = 10
+
     def __init__(self):
-        pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.Surface((10, 10))
-        self.image.fill((255, 0, 0))
+        pygame.sprite.DirtySprite.__init__(self)
+        self.__block = pygame.Surface(view.size((10, 10)))
+        self.__block.fill((255, 0, 0))
+        self.__spacing = view.length(15)
+        self.__blocks = 0
+        self.image = pygame.Surface((self.MAX_BLOCKS * self.__spacing, self.__block.get_height()), pygame.SRCALPHA)
+        self.rect = self.image.get_rect()
+        self.visible = 0
+
+    def update(self, force, cueBall_pos):
+        blocks = min(math.ceil(force / 2000), self.MAX_BLOCKS)
+        topleft = view.to_screen((cueBall_pos[0] - 30, cueBall_pos[1] + 30))
+        if blocks == self.__blocks and topleft == self.rect.topleft:
+            return
+        self.image.fill((0, 0, 0, 0))
+        for block in range(blocks):
+            self.image.blit(self.__block, (block * self.__spacing, 0))
+        self.rect.topleft = topleft
+        self.__blocks = blocks
+        self.visible = 1 if blocks > 0 else 0
+        self.dirty = 1
+
+
+# ================================================ AIM GUIDE =======================================================
+
+class AimGuide(pygame.sprite.DirtySprite):
+
+    """
+    Shows where a shot will go: the aiming line to the first contact, the ghost ball there and the
+    deflection lines (object ball and cue ball after a hit, or the bounce off a cushion).
+    Traces come from GameState.trace_aim and are cached per cue rotation bucket until invalidate()
+    says the table changed, so a still mouse costs nothing and moving back over an angle is a lookup.
+    """
+
+    CACHE_SIZE = 256
+    LINE_LENGTH = 220           # Logical length of a full-speed deflection line
+    COLOUR = (255, 255, 255, 170)
+
+    def __init__(self, game):
+        pygame.sprite.DirtySprite.__init__(self)
+        self.__game = game
+        self.__traces = collections.OrderedDict()
+        self.__bucket = None
+        self.image = pygame.Surface((1, 1), pygame.SRCALPHA)
+        self.rect = self.image.get_rect()
+        self.visible = 0
+
+    def invalidate(self):
+        # The balls moved: every cached trace is stale
+        self.__traces.clear()
+        self.__bucket = None
+
+    def update(self, cue_angle):
+        bucket = round(cue_angle / Cue.ROTATION_STEP)
+        if bucket == self.__bucket:
+            return
+        trace = self.__traces.get(bucket)
+        if trace is None:
+            trace = self.__game.trace_aim(bucket * Cue.ROTATION_STEP)
+            self.__traces[bucket] = trace
+            if len(self.__traces) > self.CACHE_SIZE:
+                self.__traces.popitem(last=False)
+        else:
+            self.__traces.move_to_end(bucket)
+        self.__bucket = bucket
+        self.__render(trace)
+
+    def __render(self, trace):
+        # Lines are (start, end) in logical coordinates, drawn into a surface just big enough to hold them
+        radius = self.__game.get_cue_ball().get_shape().radius
+        ghost = trace["ghost"]
+        lines = [(trace["start"], ghost)]
+        if trace["hit"] == "ball":
+            lines.append((trace["target"], trace["target"] + trace["target_dir"] * self.LINE_LENGTH))
+            lines.append((ghost, ghost + trace["cue_dir"] * self.LINE_LENGTH))
+        elif trace["hit"] == "cushion":
+            lines.append((ghost, ghost + trace["bounce_dir"] * self.LINE_LENGTH))
+
+        points = [view.to_screen(point) for line in lines for point in line]
+        pad = view.length(radius) + 2
+        left = min(x for x, y in points) - pad
+        top = min(y for x, y in points) - pad
+        width = max(x for x, y in points) + pad - left
+        height = max(y for x, y in points) + pad - top
+
+        self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+        line_w = view.length(2)
+        for i in range(0, len(points), 2):
+            a, b = points[i], points[i + 1]
+            pygame.draw.line(self.image, self.COLOUR, (a[0] - left, a[1] - top), (b[0] - left, b[1] - top), line_w)
+        if trace["hit"] is not None:
+            x, y = view.to_screen(ghost)
+            pygame.draw.circle(self.image, self.COLOUR, (x - left, y - top), view.length(radius), line_w)
+        self.rect = self.image.get_rect(topleft=(left, top))
+        self.dirty = 1
 
 
 # ================================================= POCKETS =======================================================
@@ -214,59 +412,84 @@ class PowerBar(pygame.sprite.Sprite):
 class Pockets():
 
     """
-    Contains logic for detecting when balls fall into pockets.
+    Contains logic for detecting when balls fall into pockets (pocket centres are logical table coordinates).
+    Each pocket is a sensor circle in the space: pymunk reports a ball as it starts touching one and the
+    ball is queued, so pocketing costs nothing until a ball actually drops.
     """
 
-    def __init__(self, sound, screen_h):
+    def __init__(self, sound, space, ball_radius=18):
         self.__pocket_diameter = 66
         self.__pockets = [
             (55, 63), (592, 48), (1134, 64),
             (55, 616), (592, 629), (1134, 616)
         ]
-        self.__potted_sound_effect = sound
-        self.__screen_h = screen_h
-        self.__i = 0
-
-    def if_potted(self, balls, space, potted_balls, allSpritesBalls, cueball_ispotted, potted_balls_sprites, allSpritesPottedBalls):
-        self.__balls_to_remove = []
-        for b, ball in enumerate(balls):
-            for pocket in self.__pockets:
-                self.__ball_x_dist = abs(ball.get_position()[0] - pocket[0])
-                self.__ball_y_dist = abs(ball.get_position()[1] - pocket[1])
-                self.__ball_dist = math.sqrt((self.__ball_x_dist ** 2) + (self.__ball_y_dist ** 2))
-                if self.__ball_dist <= self.__pocket_diameter / 2:
-                    if (b == len(balls) - 1):
-                        cueball_ispotted = True
-                        ball.set_body_position((-10000000, -10000000))
-                        ball.set_body_velocity((0.0, 0.0))
-                    else:
-                        self.__potted_sound_effect.play()
-                        self.__balls_to_remove.append(ball)
-                        p_ball = BottomBarBalls(self.__i, ball.get_image_name(), self.__screen_h)
-                        potted_balls_sprites.append(p_ball)
-                        allSpritesPottedBalls = pygame.sprite.Group(potted_balls_sprites)
-                        self.__i += 1
-        for ball in self.__balls_to_remove:
-            if ball in balls:
-                space.remove(ball.get_body(), ball.get_shape(), ball.get_pivot())
-                allSpritesBalls.remove(ball)
+        self.__potted_sound_effect = sound  # None when running headless
+        self.__queue = []  # Ball shapes that reached a pocket during the last step
+        self.__callback = None
+
+        # A ball touches a sensor shrunk by its own radius exactly when its centre is inside the pocket
+        for centre in self.__pockets:
+            sensor = pymunk.Circle(space.static_body, self.__pocket_diameter / 2 - ball_radius, centre)
+            sensor.sensor = True
+            sensor.collision_type = POCKET_TYPE
+            sensor.filter = pymunk.ShapeFilter(categories=POCKET_CATEGORY)
+            space.add(sensor)
+        space.on_collision(BALL_TYPE, POCKET_TYPE, begin=self.__ball_dropped)
+
+    def __ball_dropped(self, arbiter, space, data):
+        # Called by pymunk inside space.step(), where shapes cannot be removed, so it is only queued
+        self.__queue.append(arbiter.shapes[0])
+
+    def if_potted(self, balls, space, potted_balls, cueball_ispotted):
+
+        """
+        Handles the balls queued during the last step: potted object balls are removed from the space
+        and their image names recorded in potted_balls. The cue ball (last in balls) is parked
+        off the table instead; returns whether it was potted.
+        """
+
+        if not self.__queue:
+            return cueball_ispotted
+        for shape in self.__queue:
+            ball = None
+            for candidate in balls:
+                if candidate.get_shape() is shape:
+                    ball = candidate
+                    break
+            if ball is None:
+                continue  # already handled
+            if self.__callback is not None:
+                self.__callback(ball, ball is balls[-1])
+            if ball is balls[-1]:
+                cueball_ispotted = True
+                ball.set_body_position((-10000000, -10000000))
+                ball.set_body_velocity((0.0, 0.0))
+            else:
+                if self.__potted_sound_effect is not None:
+                    self.__potted_sound_effect.play()
+                space.remove(*ball.get_physics())
+                ball.kill()  # drops it from any sprite groups it is drawn in
                 balls.remove(ball)
                 potted_balls.append(ball.get_image_name())
+        del self.__queue[:]
         return cueball_ispotted
 
+    def set_callback(self, callback):
+        self.__callback = callback  # called as callback(ball, is_cue_ball) as each ball drops, or None
+
 
 # ============================================= BOTTOM BAR BALLS ===================================================
 
-class BottomBarBalls(pygame.sprite.Sprite):
+class BottomBarBalls(pygame.sprite.DirtySprite):
 
     """
     Displays small versions of potted balls along the bottom bar.
     """
     def __init__(self, i, ball, screen_h):
-        pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.image.load(ball).convert_alpha()
+        pygame.sprite.DirtySprite.__init__(self)
+        self.image = assets.get_bar_ball(ball)
         self.rect = self.image.get_rect()
-        self.rect.topleft = ((10 + (i * 50)), screen_h + 10)
+        self.rect.topleft = view.to_screen(((10 + (i * 50)), screen_h + 10))
 
     def update(self):
         pass
@@ -281,10 +504,10 @@ class BottomPanel(pygame.sprite.Sprite):
     """
     def __init__(self, screen_w, bottom_p, screen_h):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.Surface((screen_w, bottom_p))
+        self.image = pygame.Surface(view.size((screen_w, bottom_p)))
         self.image.fill((139, 134, 128))
         self.rect = self.image.get_rect()
-        self.rect.topleft = (0, screen_h)
+        self.rect.topleft = view.to_screen((0, screen_h))
 
     def update(self):
         pass
@@ -292,43 +515,33 @@ class BottomPanel(pygame.sprite.Sprite):
 
 # ================================================== LABEL ========================================================
 
-class Label(pygame.sprite.Sprite):
+class Label(pygame.sprite.DirtySprite):
 
     """
-    Displays score and lives text on screen.
+    Displays score and lives text on screen (values are read from the GameState).
+    The text is only re-rendered when lives or score change.
     """
-    def __init__(self, lives, pos):
-        pygame.sprite.Sprite.__init__(self)
-        self.__font = pygame.font.SysFont("georgia", 25)
-        self.__score = 0
-        self.__lives = lives
-        self.__pos = pos
+    def __init__(self, game, pos):
+        pygame.sprite.DirtySprite.__init__(self)
+        self.__font = assets.get_font("georgia", view.length(25))
+        self.__game = game
+        self.__pos = view.to_screen(pos)
         self.__message = ""
-
-    def increase_score(self):
-        self.__score += 1
-
-    def decrease_lives(self):
-        if self.__lives != 0:
-            self.__lives -= 1
-
-    def winorlose(self, block_hit):
-        if self.__lives == 0:
-            return True
+        self.__shown = None  # (lives, score) currently rendered
 
     def get_score(self):
-        return self.__score
+        return self.__game.get_score()
 
     def get_lives(self):
-        return self.__lives
+        return self.__game.get_lives()
 
     def update(self):
-        self.__message = "Lives: %d        Score: %d" % (self.__lives, self.__score)
+        values = (self.__game.get_lives(), self.__game.get_score())
+        if values == self.__shown:
+            return
+        self.__shown = values
+        self.__message = "Lives: %d        Score: %d" % values
         self.image = self.__font.render(self.__message, 1, (0, 0, 0))
         self.rect = self.image.get_rect()
         self.rect.center = self.__pos
-
-
-
-
-
+        self.dirty = 1
@@ -0,0 +1,206 @@
+"""
+===================================================================================================================
+|  Name: Safiya                                                                                                    |
+|  Date: October 16th, 2026                                                                                        |
+|  Description: Telemetry File for 8-Ball Video Game                                                               |
+|               Records every ball-ball and ball-cushion impact, pot and scratch into a preallocated ring          |
+|               buffer that a background thread streams to a JSONL or compact binary file                          |
+|               Contains class Telemetry and function read_events                                                  |
+===================================================================================================================
+"""
+
+# =========================================== IMPORTS AND INITIALIZATION ===========================================
+
+import json
+import struct
+import threading
+import numpy
+import ball8_sprites
+
+"""
+Binary file layout (little endian): a 64 byte header (magic, version), then one 24 byte EVENT_DTYPE
+record per event. A path ending in .jsonl gets one JSON object per line with the same fields instead.
+a and b are ball indices into GameState.get_all_balls() (rack order, cue ball last), which stay unique
+in racks that repeat ball numbers or images; b is NO_BALL (null in JSONL) for anything that is not a second ball.
+x, y are logical table coordinates of the contact, or of the ball as it dropped.
+"""
+
+MAGIC = b"8BTM"
+VERSION = 2
+NO_BALL = 0xFFFF
+HEADER = struct.Struct("<4sH")
+HEADER_SIZE = 64
+CAPACITY = 4096          # Events held between flushes; more than a whole break produces
+FLUSH_INTERVAL = 0.25    # Seconds between background flushes (sooner once the buffer is half full)
+
+KINDS = ("ball", "cushion", "pot", "scratch")
+BALL, CUSHION, POT, SCRATCH = range(len(KINDS))
+EVENT_DTYPE = numpy.dtype([
+    ("step", "<u4"),
+    ("a", "<u2"),
+    ("b", "<u2"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("impulse", "<f4"),
+    ("kind", "u1"),
+    ("pad", "u1", (3,)),
+])
+
+
+# ================================================ TELEMETRY =======================================================
+
+class Telemetry():
+
+    """
+    Hooks a GameState's collision and pot callbacks. Only the first solved step of each contact is recorded
+    (the impact, with the impulse that resolved it), so balls rolling along a cushion or resting against
+    each other do not flood the buffer.
+    The physics thread only writes numbers into preallocated columns; the writer thread copies out
+    what is new and formats it. If the writer falls a whole buffer behind, new events are dropped and counted.
+    """
+
+    def __init__(self, path, capacity=CAPACITY):
+        self.__jsonl = path.endswith(".jsonl")
+        self.__file = open(path, "w" if self.__jsonl else "wb")
+        if not self.__jsonl:
+            self.__file.write(HEADER.pack(MAGIC, VERSION).ljust(HEADER_SIZE, b"\0"))
+
+        self.__ring = numpy.zeros(capacity, dtype=EVENT_DTYPE)
+        self.__step = self.__ring["step"]  # Column views, so recording is plain item assignment
+        self.__kind = self.__ring["kind"]
+        self.__a = self.__ring["a"]
+        self.__b = self.__ring["b"]
+        self.__x = self.__ring["x"]
+        self.__y = self.__ring["y"]
+        self.__impulse = self.__ring["impulse"]
+        self.__capacity = capacity
+        self.__written = 0   # Only ever advanced by the physics thread
+        self.__flushed = 0   # Only ever advanced by the writer thread
+        self.__dropped = 0
+
+        self.__game = None
+        self.__indices = {}  # Ball shape -> index into GameState.get_all_balls()
+        self.__wake = threading.Event()
+        self.__closing = False
+        self.__thread = threading.Thread(target=self.__run, name="telemetry", daemon=True)
+        self.__thread.start()
+
+    def attach(self, game):
+        self.__game = game
+        for i, ball in enumerate(game.get_all_balls()):
+            self.__indices[ball.get_shape()] = i
+        space = game.get_space()
+        space.on_collision(ball8_sprites.BALL_TYPE, ball8_sprites.BALL_TYPE, post_solve=self.__contact, data=BALL)
+        space.on_collision(ball8_sprites.BALL_TYPE, ball8_sprites.CUSHION_TYPE, post_solve=self.__contact, data=CUSHION)
+        game.set_pot_callback(self.__potted)
+
+    def detach(self, game):
+        space = game.get_space()
+        space.on_collision(ball8_sprites.BALL_TYPE, ball8_sprites.BALL_TYPE)
+        space.on_collision(ball8_sprites.BALL_TYPE, ball8_sprites.CUSHION_TYPE)
+        game.set_pot_callback(None)
+        self.__game = None
+
+    # === Recording (physics thread) ===
+
+    def __record(self, step, kind, a, b, x, y, impulse):
+        if self.__written - self.__flushed >= self.__capacity:
+            self.__dropped += 1
+            return
+        i = self.__written % self.__capacity
+        self.__step[i] = step
+        self.__kind[i] = kind
+        self.__a[i] = a
+        self.__b[i] = b
+        self.__x[i] = x
+        self.__y[i] = y
+        self.__impulse[i] = impulse
+        self.__written += 1  # Published only once the row is complete
+        if self.__written - self.__flushed == self.__capacity // 2:
+            self.__wake.set()
+
+    def __contact(self, arbiter, space, kind):
+        # post_solve handler, called inside space.step(): that step has not been counted yet
+        if not arbiter.is_first_contact:
+            return
+        shape_a, shape_b = arbiter.shapes
+        point = arbiter.contact_point_set.points[0].point_a
+        self.__record(self.__game.get_steps() + 1, kind, self.__indices.get(shape_a, NO_BALL),
+                      self.__indices.get(shape_b, NO_BALL), point.x, point.y, arbiter.total_impulse.length)
+
+    def __potted(self, ball, scratch):
+        # Pot callback, called just before the ball is taken off the table
+        x, y = ball.get_position()
+        self.__record(self.__game.get_steps(), SCRATCH if scratch else POT, self.__indices[ball.get_shape()], NO_BALL,
+                      x, y, 0.0)
+
+    # === Writing (writer thread) ===
+
+    def __run(self):
+        while not self.__closing:
+            self.__wake.wait(FLUSH_INTERVAL)
+            self.__wake.clear()
+            self.__flush()
+        self.__flush()
+
+    def __flush(self):
+        written = self.__written
+        start = self.__flushed % self.__capacity
+        count = written - self.__flushed
+        if count == 0:
+            return
+        if start + count <= self.__capacity:
+            rows = self.__ring[start:start + count].copy()
+        else:
+            rows = numpy.concatenate((self.__ring[start:], self.__ring[:start + count - self.__capacity]))
+        self.__flushed = written  # The physics thread may reuse those rows now
+
+        if self.__jsonl:
+            lines = []
+            for row in rows:
+                lines.append(json.dumps({
+                    "step": int(row["step"]), "kind": KINDS[row["kind"]], "a": int(row["a"]),
+                    "b": None if row["b"] == NO_BALL else int(row["b"]),
+                    "x": round(float(row["x"]), 2), "y": round(float(row["y"]), 2),
+                    "impulse": round(float(row["impulse"]), 2),
+                }))
+            self.__file.write("\n".join(lines) + "\n")
+        else:
+            self.__file.write(rows.tobytes())
+        self.__file.flush()
+
+    def close(self):
+
+        """
+        Writes out whatever is still buffered and closes the file.
+        """
+
+        self.__closing = True
+        self.__wake.set()
+        self.__thread.join()
+        self.__file.close()
+
+    def get_event_count(self):
+        return self.__written
+
+    def get_dropped(self):
+        return self.__dropped
+
+
+# ================================================= READER =========================================================
+
+def read_events(path):
+
+    """
+    Memory-maps a binary telemetry file as an EVENT_DTYPE array (empty if nothing was recorded).
+    """
+
+    with open(path, "rb") as f:
+        magic, version = HEADER.unpack(f.read(HEADER.size))
+        f.seek(0, 2)
+        size = f.tell()
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("{} is not a version {} 8-ball telemetry file".format(path, VERSION))
+    if size == HEADER_SIZE:
+        return numpy.zeros(0, dtype=EVENT_DTYPE)
+    return numpy.memmap(path, dtype=EVENT_DTYPE, mode="r", offset=HEADER_SIZE)
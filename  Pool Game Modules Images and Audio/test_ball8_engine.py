@@ -0,0 +1,82 @@
+import pytest
+import ball8_engine
+
+
+def test_nine_ball_on_centre_spot():
+    balls, cue_pos, ball_dia = ball8_engine.rack_layout("9ball")
+    positions = dict(balls)
+    xs = sorted(pos[0] for number, pos in balls)
+    centre = ((xs[0] + xs[-1]) / 2, ball8_engine.SCREEN_H / 2)
+    assert positions[9] == pytest.approx(centre)
+    assert len(positions) == 9  # every number once
+
+
+def test_small_balls_pot_when_their_centre_enters_the_pocket():
+    game = ball8_engine.GameState(rack="stress", ball_count=600)
+    ball = game.get_balls()[0]
+    radius = ball.get_shape().radius
+    assert radius < ball8_engine.BALL_DIA / 2
+    # Centre just inside the 33 px pocket radius of the top left pocket at (55, 63)
+    ball.set_body_position((55 + 32, 63))
+    ball.set_body_velocity((1.0, 0.0))
+    game.take_shot(0, 0)
+    game.step()
+    assert ball not in game.get_balls()
+
+
+def pot(game, index):
+    # Drop the ball into the top left pocket with a shot too soft to move anything else
+    game.get_all_balls()[index].set_body_position((57, 66))
+    game.play_shot(90, 10)
+    assert game.get_all_balls()[index] not in game.get_balls()
+
+
+def test_restore_puts_a_potted_red_back():
+    game = ball8_engine.GameState(rack="snooker")
+    assert len(game.get_balls()) == 22
+    snapshot = game.snapshot()
+    pot(game, 0)
+    assert len(game.get_balls()) == 21
+
+    returned = game.restore(snapshot)
+    assert returned == [game.get_all_balls()[0]]
+    assert len(game.get_balls()) == 22
+    assert game.get_potted_balls() == []
+
+
+def test_undo_keeps_the_pot_order():
+    # Snooker reds all share one image, so the order has to be kept per ball, not per name
+    game = ball8_engine.GameState(rack="snooker")
+    red, colour = game.get_all_balls()[0], game.get_all_balls()[15]
+    pot(game, 0)
+    pot(game, 15)
+    pot(game, 3)
+    order = [red.get_image_name(), colour.get_image_name(), red.get_image_name()]
+    assert game.get_potted_balls() == order
+
+    undo = game.snapshot()
+    pot(game, 5)
+    game.restore(undo)
+    assert game.get_potted_balls() == order
+    assert len(game.get_balls()) == 19
+    assert game.get_all_balls()[5] in game.get_balls()
+
+
+def lone_cue_ball_shot(friction, force):
+    # Just the cue ball and one object ball parked out of its way; returns where the cue ball stopped and when
+    game = ball8_engine.GameState(friction=friction)
+    space = game.get_space()
+    for ball in game.get_balls()[1:-1]:
+        space.remove(*ball.get_physics())
+    del game.get_balls()[1:-1]
+    game.get_balls()[0].set_body_position((300, 120))
+    steps = game.play_shot(0, force)
+    return game.get_cue_ball().get_position(), steps
+
+
+@pytest.mark.parametrize("force", [1000, 3000, 10000])
+def test_damping_rolls_like_pivot(force):
+    pivot_pos, pivot_steps = lone_cue_ball_shot("pivot", force)
+    damping_pos, damping_steps = lone_cue_ball_shot("damping", force)
+    assert damping_pos.get_distance(pivot_pos) < 10
+    assert abs(damping_steps - pivot_steps) <= 3
@@ -0,0 +1,25 @@
+import numpy
+import ball8_net
+
+
+def test_delta_round_trip_with_scratch():
+    encoder = ball8_net.DeltaEncoder(3)
+    decoder = ball8_net.DeltaDecoder(3)
+    positions = numpy.array([[100.0, 200.0], [300.5, 400.25], [900.0, 339.0]])
+    on_table = numpy.array([True, True, True])
+    decoded, decoded_on_table = decoder.decode(encoder.encode(positions, on_table))
+    assert numpy.allclose(decoded, positions, atol=1 / ball8_net.QUANTUM)
+    assert decoded_on_table.all()
+
+    # The cue ball drops and is parked off the table until it is re-spotted
+    positions[1] = (310.0, 410.0)
+    positions[2] = ball8_net.OFF_TABLE
+    decoded, decoded_on_table = decoder.decode(encoder.encode(positions, on_table))
+    assert decoded_on_table.tolist() == [True, True, False]
+    assert numpy.allclose(decoded[:2], positions[:2], atol=1 / ball8_net.QUANTUM)
+
+    # Re-spotted: back on the table at its new position
+    positions[2] = (900.0, 339.0)
+    decoded, decoded_on_table = decoder.decode(encoder.encode(positions, on_table))
+    assert decoded_on_table.all()
+    assert numpy.allclose(decoded, positions, atol=1 / ball8_net.QUANTUM)